@@ -5,10 +5,14 @@ Extracted from google-ads-manager for integration with GAds-Claude
 
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
+from authenticate import get_service
 from typing import Optional
 from datetime import datetime
 import streamlit as st
+import grpc
 import logging
+import random
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -23,10 +27,39 @@ US_TIMEZONES = {
     "Pacific/Honolulu": "Hawaii Time (HST)"
 }
 
-def get_sub_accounts(client: GoogleAdsClient, mcc_customer_id: str) -> list[dict]:
-    """Fetch all direct, active sub-accounts under the MCC account using GAQL."""
+# Hardcoded shared negative keywords list applied to new campaigns - PPCL List
+PPCL_NEGATIVE_LIST_ID = "11404993599"
+
+# Field names that differ between API versions, probed in order
+_BUDGET_SHARED_FIELDS = ('explicitly_shared', 'is_shared')
+_EU_POLITICAL_FIELDS = (
+    'contains_eu_political_advertising',
+    'eu_political_advertising',
+    'eu_political_content',
+    'political_advertising',
+    'political_content'
+)
+
+# Resolved field name per (message type, candidates), see _resolve_field()
+_resolved_fields = {}
+
+def _resolve_field(message, candidates: tuple) -> Optional[str]:
+    """Return the first of candidates that exists on message, probing only once per message type."""
+    key = (type(message).__name__, candidates)
+    if key not in _resolved_fields:
+        _resolved_fields[key] = next((name for name in candidates if hasattr(message, name)), None)
+    return _resolved_fields[key]
+
+@st.cache_resource(ttl=1800, show_spinner=False)
+def get_sub_accounts(_client: GoogleAdsClient, mcc_customer_id: str) -> tuple[dict, ...]:
+    """Fetch all direct, active sub-accounts under the MCC account using GAQL.
+
+    Cached as a shared resource keyed on the MCC ID only (the client is not
+    hashed), so every session reuses one fetch for up to 30 minutes. Call
+    get_sub_accounts.clear() after creating a sub-account.
+    """
     try:
-        ga_service = client.get_service("GoogleAdsService")
+        ga_service = get_service(_client, "GoogleAdsService")
         
         # Convert MCC ID to numeric format (remove dashes)
         mcc_customer_id_numeric = mcc_customer_id.replace("-", "")
@@ -44,24 +77,27 @@ def get_sub_accounts(client: GoogleAdsClient, mcc_customer_id: str) -> list[dict
             AND customer_client.status = 'ENABLED'
         """
         
-        response = ga_service.search(customer_id=mcc_customer_id_numeric, query=query)
+        # search_stream returns every row over a single server-streaming RPC
+        # instead of paging through the result set one request at a time
+        stream = ga_service.search_stream(customer_id=mcc_customer_id_numeric, query=query)
         
         sub_accounts = []
-        for row in response:
-            customer_id = str(row.customer_client.id)
-            # Format customer ID with dashes
-            formatted_id = f"{customer_id[:3]}-{customer_id[3:6]}-{customer_id[6:]}"
-            
-            sub_accounts.append({
-                'id': formatted_id,
-                'name': row.customer_client.descriptive_name,
-                'display': f"{row.customer_client.descriptive_name} ({formatted_id})",
-                'currency': row.customer_client.currency_code,
-                'timezone': row.customer_client.time_zone
-            })
+        for batch in stream:
+            for row in batch.results:
+                customer_id = str(row.customer_client.id)
+                # Format customer ID with dashes
+                formatted_id = f"{customer_id[:3]}-{customer_id[3:6]}-{customer_id[6:]}"
+                
+                sub_accounts.append({
+                    'id': formatted_id,
+                    'name': row.customer_client.descriptive_name,
+                    'display': f"{row.customer_client.descriptive_name} ({formatted_id})",
+                    'currency': row.customer_client.currency_code,
+                    'timezone': row.customer_client.time_zone
+                })
         
         sub_accounts.sort(key=lambda x: x['name'])
-        return sub_accounts
+        return tuple(sub_accounts)
         
     except GoogleAdsException as ex:
         error_msg = ex.error.message() if hasattr(ex.error, 'message') else str(ex)
@@ -73,7 +109,7 @@ def create_sub_account(client: GoogleAdsClient, mcc_customer_id: str, account_na
     Sub-accounts are created without MCC payment profile linking so clients can set up their own payment methods.
     """
     try:
-        customer_service = client.get_service("CustomerService")
+        customer_service = get_service(client, "CustomerService")
         customer = client.get_type("Customer")
         customer.descriptive_name = account_name
         customer.currency_code = currency_code
@@ -88,66 +124,104 @@ def create_sub_account(client: GoogleAdsClient, mcc_customer_id: str, account_na
             customer_client=customer
         )
         
-        # Extract the new customer ID from the response
-        new_customer_id = None
-        try:
-            if hasattr(response, 'customer_client') and hasattr(response.customer_client, 'id'):
-                new_customer_id = response.customer_client.id
-            elif hasattr(response, 'resource_name'):
-                new_customer_id = response.resource_name.split('/')[-1]
-            elif hasattr(response, 'results') and len(response.results) > 0:
-                new_customer_id = response.results[0].resource_name.split('/')[-1]
-            else:
-                new_customer_id = str(response).split('customers/')[-1].split('/')[0]
-        except Exception as parse_error:
-            logger.warning(f"Could not parse response structure: {parse_error}")
-            return "UNKNOWN"
-        
-        if new_customer_id and new_customer_id != "UNKNOWN":
-            # Format customer ID with dashes
-            formatted_id = f"{new_customer_id[:3]}-{new_customer_id[3:6]}-{new_customer_id[6:]}"
-            return formatted_id
-        
-        return new_customer_id
-        
-    except Exception as ex:
+        # CreateCustomerClientResponse carries the new account's resource name
+        # (customers/{customer_id}) directly
+        if not response.resource_name:
+            raise Exception("Error creating sub-account: response did not include a resource name")
+        new_customer_id = response.resource_name.split('/')[-1]
+        
+        # Format customer ID with dashes
+        return f"{new_customer_id[:3]}-{new_customer_id[3:6]}-{new_customer_id[6:]}"
+        
+    except GoogleAdsException as ex:
         error_msg = ex.error.message() if hasattr(ex.error, 'message') else str(ex)
         raise Exception(f"Error creating sub-account: {error_msg}")
 
+# Errors Google recommends retrying with backoff, by error_code field and enum name.
+# Only errors that mean the request was not applied are listed: mutates are not
+# idempotent, so a timed-out (DEADLINE_EXCEEDED) write may already have committed
+# and a retry would fail on the duplicate name.
+_RETRYABLE_ERRORS = {
+    'quota_error': frozenset({'RESOURCE_EXHAUSTED', 'RESOURCE_TEMPORARILY_EXHAUSTED'}),
+    'internal_error': frozenset({'INTERNAL_ERROR', 'TRANSIENT_ERROR'}),
+}
+_RETRYABLE_STATUS_CODES = frozenset({grpc.StatusCode.UNAVAILABLE})
+
+def _is_transient_error(ex: Exception) -> bool:
+    """Check whether a failed mutate is safe and worth retrying (quota exhaustion, internal, unavailable)."""
+    if isinstance(ex, GoogleAdsException):
+        for error in ex.failure.errors:
+            error_kind = type(error.error_code).pb(error.error_code).WhichOneof("error_code")
+            if error_kind in _RETRYABLE_ERRORS and getattr(error.error_code, error_kind).name in _RETRYABLE_ERRORS[error_kind]:
+                return True
+        return ex.error.code() in _RETRYABLE_STATUS_CODES
+    if isinstance(ex, grpc.RpcError):
+        return ex.code() in _RETRYABLE_STATUS_CODES
+    return False
+
+def _call_with_retry(fn, max_attempts: int = 4, base_delay: float = 2.0):
+    """Run fn(), retrying transient API errors with jittered exponential backoff (about 2s, 4s, 8s)."""
+    for attempt in range(max_attempts):
+        try:
+            return fn()
+        except (GoogleAdsException, grpc.RpcError) as ex:
+            if attempt == max_attempts - 1 or not _is_transient_error(ex):
+                raise
+            delay = base_delay * 2 ** attempt + random.random() * base_delay
+            logger.warning(f"Transient Google Ads API error, retrying in {delay:.2f}s (attempt {attempt + 1}/{max_attempts})")
+            time.sleep(delay)
+
+def _apply_common_campaign_settings(client: GoogleAdsClient, campaign) -> None:
+    """Apply the network and location targeting settings shared by every new campaign.
+
+    Fields are assigned in place on the campaign's nested messages, so no
+    intermediate NetworkSettings/GeoTargetTypeSetting objects are built.
+    """
+    network_settings = campaign.network_settings
+    network_settings.target_google_search = True
+    network_settings.target_search_network = False
+    network_settings.target_content_network = False
+    network_settings.target_partner_search_network = False
+    
+    geo_setting = campaign.geo_target_type_setting
+    geo_setting.positive_geo_target_type = client.enums.PositiveGeoTargetTypeEnum.PRESENCE
+    geo_setting.negative_geo_target_type = client.enums.NegativeGeoTargetTypeEnum.PRESENCE
+
 def create_campaign(client: GoogleAdsClient, customer_id: str, campaign_name: str, 
                    budget_amount: float) -> Optional[str]:
     """Create a campaign with daily budget and Maximize Clicks bidding strategy."""
+    # One clock read for both the budget name and the campaign start date
+    now = datetime.now()
+    
     try:
-        campaign_service = client.get_service("CampaignService")
-        campaign_budget_service = client.get_service("CampaignBudgetService")
+        ga_service = get_service(client, "GoogleAdsService")
         
         customer_id_numeric = customer_id.replace("-", "")
+        customer_prefix = f"customers/{customer_id_numeric}"
+        
+        # Budget and campaign are created atomically in a single GoogleAdsService.mutate,
+        # the campaign referencing the budget via its temporary resource name (-1)
+        budget_resource_name = f"{customer_prefix}/campaignBudgets/-1"
         
         # Generate unique budget name with timestamp
-        timestamp = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
-        budget_name = f"Budget for {campaign_name} - {timestamp}"
+        budget_name = f"Budget for {campaign_name} - {now.strftime('%Y-%m-%d-%H-%M-%S')}"
         
         # Create campaign budget operation
-        budget_operation = client.get_type("CampaignBudgetOperation")
-        campaign_budget = budget_operation.create
+        budget_operation = client.get_type("MutateOperation")
+        campaign_budget = budget_operation.campaign_budget_operation.create
+        campaign_budget.resource_name = budget_resource_name
         campaign_budget.name = budget_name
         campaign_budget.amount_micros = int(float(budget_amount) * 1000000)  # Convert to micros
         campaign_budget.delivery_method = client.enums.BudgetDeliveryMethodEnum.STANDARD
         
         # Ensure budget is not shared (campaign-specific)
-        if hasattr(campaign_budget, 'explicitly_shared'):
-            campaign_budget.explicitly_shared = False
-        elif hasattr(campaign_budget, 'is_shared'):
-            campaign_budget.is_shared = False
-        
-        budget_response = campaign_budget_service.mutate_campaign_budgets(
-            customer_id=customer_id_numeric, operations=[budget_operation]
-        )
-        budget_resource_name = budget_response.results[0].resource_name
+        shared_field = _resolve_field(campaign_budget, _BUDGET_SHARED_FIELDS)
+        if shared_field:
+            setattr(campaign_budget, shared_field, False)
         
         # Create campaign operation
-        campaign_operation = client.get_type("CampaignOperation")
-        campaign = campaign_operation.create
+        campaign_operation = client.get_type("MutateOperation")
+        campaign = campaign_operation.campaign_operation.create
         campaign.name = campaign_name
         campaign.status = client.enums.CampaignStatusEnum.PAUSED  # Set to PAUSED
         campaign.campaign_budget = budget_resource_name
@@ -160,68 +234,46 @@ def create_campaign(client: GoogleAdsClient, customer_id: str, campaign_name: st
             logger.warning(f"Failed to set Maximize Clicks bidding strategy: {bidding_error}")
             raise
         
-        # Hardcoded shared negative keywords list - PPCL List
-        ppcl_negative_list_id = "11404993599"
+        # Google Search only, "Presence Only" location targeting
+        _apply_common_campaign_settings(client, campaign)
         
-        # Configure network settings
-        try:
-            campaign.network_settings.target_google_search = True
-            campaign.network_settings.target_search_network = False
-            campaign.network_settings.target_content_network = False
-            campaign.network_settings.target_partner_search_network = False
-        except Exception as network_error:
-            logger.warning(f"Could not configure network settings: {network_error}")
-        
-        # Configure location targeting behavior to "Presence Only"
-        try:
-            campaign.geo_target_type_setting.positive_geo_target_type = client.enums.PositiveGeoTargetTypeEnum.PRESENCE
-            campaign.geo_target_type_setting.negative_geo_target_type = client.enums.NegativeGeoTargetTypeEnum.PRESENCE
-        except Exception as geo_error:
-            logger.warning(f"Could not configure location targeting: {geo_error}")
-        
-        campaign.start_date = datetime.now().strftime("%Y-%m-%d")
+        campaign.start_date = now.strftime("%Y-%m-%d")
         
         # Set EU political advertising field (required in API v21)
         try:
-            eu_field_names = [
-                'contains_eu_political_advertising',
-                'eu_political_advertising',
-                'eu_political_content',
-                'political_advertising',
-                'political_content'
-            ]
-            
-            for field_name in eu_field_names:
-                if hasattr(campaign, field_name):
-                    setattr(campaign, field_name, client.enums.EuPoliticalAdvertisingStatusEnum.DOES_NOT_CONTAIN_EU_POLITICAL_ADVERTISING)
-                    break
+            eu_field = _resolve_field(campaign, _EU_POLITICAL_FIELDS)
+            if eu_field:
+                setattr(campaign, eu_field, client.enums.EuPoliticalAdvertisingStatusEnum.DOES_NOT_CONTAIN_EU_POLITICAL_ADVERTISING)
         except Exception as eu_error:
             logger.warning(f"Failed to set EU political advertising field: {eu_error}")
         
-        # Create the campaign
-        response = campaign_service.mutate_campaigns(
-            customer_id=customer_id_numeric, operations=[campaign_operation]
-        )
-        campaign_id = response.results[0].resource_name.split("/")[-1]
+        request = client.get_type("MutateGoogleAdsRequest")
+        request.customer_id = customer_id_numeric
+        request.mutate_operations = [budget_operation, campaign_operation]
+        response = _call_with_retry(lambda: ga_service.mutate(request=request))
+        
+        # Without partial failure any error raises, so both results are present here
+        campaign_resource_name = response.mutate_operation_responses[1].campaign_result.resource_name
+        campaign_id = campaign_resource_name.split("/")[-1]
         
-        # Apply shared negative keywords list to the campaign
+        # Apply shared negative keywords list to the campaign (best-effort: the
+        # campaign already exists, so a failed link is only logged)
         try:
-            campaign_shared_set_service = client.get_service("CampaignSharedSetService")
+            campaign_shared_set_service = get_service(client, "CampaignSharedSetService")
             campaign_shared_set_operation = client.get_type("CampaignSharedSetOperation")
             campaign_shared_set = campaign_shared_set_operation.create
-            campaign_shared_set.campaign = f"customers/{customer_id_numeric}/campaigns/{campaign_id}"
-            campaign_shared_set.shared_set = f"customers/{customer_id_numeric}/sharedSets/{ppcl_negative_list_id}"
-            
-            shared_set_response = campaign_shared_set_service.mutate_campaign_shared_sets(
+            campaign_shared_set.campaign = campaign_resource_name
+            campaign_shared_set.shared_set = f"{customer_prefix}/sharedSets/{PPCL_NEGATIVE_LIST_ID}"
+            _call_with_retry(lambda: campaign_shared_set_service.mutate_campaign_shared_sets(
                 customer_id=customer_id_numeric,
                 operations=[campaign_shared_set_operation]
-            )
+            ))
         except Exception as negative_error:
             logger.warning(f"Could not apply negative keywords list: {negative_error}")
         
         return campaign_id
         
-    except Exception as ex:
+    except GoogleAdsException as ex:
         error_msg = ex.error.message() if hasattr(ex.error, 'message') else str(ex)
         raise Exception(f"Error creating campaign: {error_msg}")
 
@@ -5,6 +5,7 @@ FIXED VERSION - Properly handles MCC account listing
 
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
+from authenticate import get_service
 import os
 from dotenv import load_dotenv
 
@@ -22,7 +23,7 @@ def list_customer_accounts(client, login_customer_id=None):
         raise ValueError("Customer ID (MCC or account) is required")
     
     try:
-        ga_service = client.get_service("GoogleAdsService")
+        ga_service = get_service(client, "GoogleAdsService")
         
         # Use customer_client resource - this is the correct way to list accounts under MCC
         query = """
@@ -43,31 +44,33 @@ def list_customer_accounts(client, login_customer_id=None):
         try:
             # Query customer_client from the MCC
             # The customer_id should be the MCC in numeric format
-            response = ga_service.search(customer_id=login_customer_id_numeric, query=query)
+            # search_stream returns all rows over a single streaming RPC
+            stream = ga_service.search_stream(customer_id=login_customer_id_numeric, query=query)
             
             customers = []
-            for row in response:
-                # Extract customer ID from client_customer resource name
-                client_customer_resource = row.customer_client.client_customer
-                customer_id_numeric = client_customer_resource.split('/')[-1]
+            for batch in stream:
+                for row in batch.results:
+                    # Extract customer ID from client_customer resource name
+                    client_customer_resource = row.customer_client.client_customer
+                    customer_id_numeric = client_customer_resource.split('/')[-1]
                 
-                # Format customer ID (1234567890 -> 123-456-7890)
-                formatted_id = f"{customer_id_numeric[:3]}-{customer_id_numeric[3:6]}-{customer_id_numeric[6:]}"
+                    # Format customer ID (1234567890 -> 123-456-7890)
+                    formatted_id = f"{customer_id_numeric[:3]}-{customer_id_numeric[3:6]}-{customer_id_numeric[6:]}"
                 
-                # Skip if this is the MCC account itself
-                if formatted_id == login_customer_id:
-                    continue
+                    # Skip if this is the MCC account itself
+                    if formatted_id == login_customer_id:
+                        continue
                 
-                # Only add if it's NOT a manager account
-                if not row.customer_client.manager:
-                    customers.append({
-                        'customer_id': formatted_id,
-                        'descriptive_name': row.customer_client.descriptive_name or formatted_id,
-                        'currency_code': row.customer_client.currency_code if hasattr(row.customer_client, 'currency_code') else 'N/A',
-                        'time_zone': row.customer_client.time_zone if hasattr(row.customer_client, 'time_zone') else 'N/A',
-                        'manager': False,
-                        'test_account': row.customer_client.test_account if hasattr(row.customer_client, 'test_account') else False
-                    })
+                    # Only add if it's NOT a manager account
+                    if not row.customer_client.manager:
+                        customers.append({
+                            'customer_id': formatted_id,
+                            'descriptive_name': row.customer_client.descriptive_name or formatted_id,
+                            'currency_code': row.customer_client.currency_code if hasattr(row.customer_client, 'currency_code') else 'N/A',
+                            'time_zone': row.customer_client.time_zone if hasattr(row.customer_client, 'time_zone') else 'N/A',
+                            'manager': False,
+                            'test_account': row.customer_client.test_account if hasattr(row.customer_client, 'test_account') else False
+                        })
             
             return customers
             
@@ -103,7 +106,7 @@ def list_campaigns(client, customer_id):
         customer_id: Customer account ID (format: 123-456-7890)
     """
     try:
-        ga_service = client.get_service("GoogleAdsService")
+        ga_service = get_service(client, "GoogleAdsService")
         
         query = """
             SELECT
@@ -119,17 +122,18 @@ def list_campaigns(client, customer_id):
         
         # Convert customer_id to numeric format (remove dashes) for API
         customer_id_numeric = customer_id.replace("-", "")
-        response = ga_service.search(customer_id=customer_id_numeric, query=query)
+        stream = ga_service.search_stream(customer_id=customer_id_numeric, query=query)
         
         campaigns = []
-        for row in response:
-            campaigns.append({
-                'campaign_id': row.campaign.id,
-                'campaign_name': row.campaign.name,
-                'status': row.campaign.status.name,
-                'start_date': row.campaign.start_date if hasattr(row.campaign, 'start_date') else 'N/A',
-                'end_date': row.campaign.end_date if hasattr(row.campaign, 'end_date') else 'N/A'
-            })
+        for batch in stream:
+            for row in batch.results:
+                campaigns.append({
+                    'campaign_id': row.campaign.id,
+                    'campaign_name': row.campaign.name,
+                    'status': row.campaign.status.name,
+                    'start_date': row.campaign.start_date if hasattr(row.campaign, 'start_date') else 'N/A',
+                    'end_date': row.campaign.end_date if hasattr(row.campaign, 'end_date') else 'N/A'
+                })
         
         return campaigns
         
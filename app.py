@@ -5,8 +5,8 @@ Modern web interface for Google Ads campaign analysis and management
 
 import streamlit as st
 import os
+import re
 import sys
-import pandas as pd
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
@@ -14,7 +14,7 @@ from dotenv import load_dotenv
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from authenticate import get_client
-from account_manager import select_account_interactive, select_campaign_interactive, list_customer_accounts
+from account_manager import select_account_interactive, select_campaign_interactive, list_customer_accounts, list_campaigns
 from account_campaign_manager import get_sub_accounts, create_sub_account, create_campaign, US_TIMEZONES
 from real_estate_analyzer import RealEstateAnalyzer
 from comprehensive_data_fetcher import fetch_comprehensive_campaign_data, format_campaign_data_for_prompt
@@ -150,17 +150,77 @@ if 'selected_model' not in st.session_state:
     st.session_state.selected_model = os.getenv("CLAUDE_MODEL", "claude-sonnet-4-20250514")
 if 'current_page' not in st.session_state:
     st.session_state.current_page = "📊 Campaign Analysis"
+if 'cache_stats' not in st.session_state:
+    st.session_state.cache_stats = {'hits': 0, 'misses': 0}
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_customer_accounts(_client, login_customer_id=None):
+    """list_customer_accounts() cached for 5 minutes per login customer ID (client is not hashed)."""
+    return list_customer_accounts(_client, login_customer_id)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_campaigns(_client, customer_id):
+    """list_campaigns() cached for 5 minutes per customer ID (client is not hashed)."""
+    return list_campaigns(_client, customer_id)
+
+class _UncachedResult(Exception):
+    """Raised from a cached function to hand back a result that must not be cached."""
+    
+    def __init__(self, value):
+        super().__init__()
+        self.value = value
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_campaign_data(_client, customer_id, campaign_id, date_range_days, _fetch_state=None):
+    """fetch_comprehensive_campaign_data() cached for 5 minutes per account, campaign and date range.
+    
+    Switching the selected campaign or date range only fetches the new combination; previously
+    viewed ones are served from cache. _fetch_state (not hashed) is flagged when the API is hit.
+    Results with incomplete sections are raised as _UncachedResult so a transient failure is
+    not served for the next 5 minutes.
+    """
+    if _fetch_state is not None:
+        _fetch_state['miss'] = True
+    data = fetch_comprehensive_campaign_data(
+        _client,
+        customer_id,
+        campaign_id=campaign_id,
+        date_range_days=date_range_days
+    )
+    if data['incomplete_sections']:
+        raise _UncachedResult(data)
+    return data
+
+def _campaign_data(client, customer_id, campaign_id, date_range_days):
+    """Fetch report data through _cached_campaign_data(), counting cache hits/misses for this session."""
+    fetch_state = {'miss': False}
+    try:
+        data = _cached_campaign_data(client, customer_id, campaign_id, date_range_days, _fetch_state=fetch_state)
+    except _UncachedResult as uncached:
+        data = uncached.value
+    st.session_state.cache_stats['misses' if fetch_state['miss'] else 'hits'] += 1
+    return data
+
+@st.cache_resource(show_spinner=False)
+def _shared_ads_client():
+    """Build one Google Ads client per process so its service channels are reused across sessions.
+    
+    Raises when authentication fails so that a failed attempt is not cached.
+    """
+    client = get_client()
+    if client is None:
+        raise RuntimeError("Failed to authenticate with Google Ads API")
+    return client
 
 def initialize_client():
     """Initialize Google Ads client."""
     if 'client' not in st.session_state or st.session_state.client is None:
         try:
-            st.session_state.client = get_client()
-            if st.session_state.client:
-                return True
-            else:
-                st.error("❌ Failed to authenticate with Google Ads API. Please check your credentials.")
-                return False
+            st.session_state.client = _shared_ads_client()
+            return True
+        except RuntimeError:
+            st.error("❌ Failed to authenticate with Google Ads API. Please check your credentials.")
+            return False
         except Exception as e:
             st.error(f"❌ Error initializing client: {str(e)}")
             return False
@@ -172,7 +232,7 @@ def initialize_analyzer():
         try:
             # Use selected model from sidebar if available, otherwise use default
             model = st.session_state.get('selected_model', os.getenv("CLAUDE_MODEL", "claude-sonnet-4-20250514"))
-            st.session_state.analyzer = RealEstateAnalyzer(model=model)
+            st.session_state.analyzer = RealEstateAnalyzer(model=model, ads_client=st.session_state.client)
             return True
         except Exception as e:
             st.error(f"❌ Error initializing Claude analyzer: {str(e)}")
@@ -294,6 +354,22 @@ def main():
         # Store selected model for later use (analyzer not initialized yet)
         st.session_state.selected_model = model_options[selected_model]
         
+        # Account/campaign lists and report data are cached; this forces a fresh fetch
+        if st.button("🔄 Refresh Accounts & Campaigns", key="refresh_account_lists", use_container_width=True):
+            _cached_customer_accounts.clear()
+            _cached_campaigns.clear()
+            _cached_campaign_data.clear()
+            get_sub_accounts.clear()
+            st.rerun()
+        
+        # Report data cache effectiveness for this session
+        cache_stats = st.session_state.cache_stats
+        cache_lookups = cache_stats['hits'] + cache_stats['misses']
+        if cache_lookups:
+            with st.expander("Cache Stats"):
+                st.metric("Report data cache hit rate", f"{cache_stats['hits'] / cache_lookups:.0%}")
+                st.caption(f"{cache_stats['hits']} hits, {cache_stats['misses']} misses")
+        
         st.markdown("---")
         st.markdown("### Status")
         if 'client' in st.session_state and st.session_state.client:
@@ -344,7 +420,7 @@ def show_comprehensive_analysis():
         mcc_id = os.getenv("GOOGLE_ADS_CUSTOMER_ID")
         if mcc_id:
             try:
-                accounts = list_customer_accounts(st.session_state.client, mcc_id)
+                accounts = _cached_customer_accounts(st.session_state.client, mcc_id)
                 account_options = {f"{acc['descriptive_name']} ({acc['customer_id']})": acc['customer_id'] for acc in accounts}
                 selected_account_display = st.selectbox("Select Account", list(account_options.keys()))
                 selected_account_id = account_options[selected_account_display]
@@ -358,8 +434,7 @@ def show_comprehensive_analysis():
         # Get campaigns
         if selected_account_id:
             try:
-                from account_manager import list_campaigns
-                campaigns = list_campaigns(st.session_state.client, selected_account_id)
+                campaigns = _cached_campaigns(st.session_state.client, selected_account_id)
                 campaign_options = {f"{camp['campaign_name']} (ID: {camp['campaign_id']})": camp['campaign_id'] for camp in campaigns}
                 campaign_options["All Campaigns"] = None
                 selected_campaign_display = st.selectbox("Select Campaign", list(campaign_options.keys()))
@@ -473,13 +548,7 @@ def show_comprehensive_analysis():
         # Save options (PDF and Drive) - moved after change tracking
         st.markdown("---")
         st.markdown("### 💾 Export Options")
-        col1, col2 = st.columns(2)
-        with col1:
-            if st.button("💾 Save to PDF", use_container_width=True, key="save_pdf_analysis_stored"):
-                _save_analysis_to_pdf()
-        with col2:
-            if st.button("📤 Upload to Google Drive", use_container_width=True, key="upload_drive_analysis_stored"):
-                _upload_analysis_to_drive()
+        _analysis_export_options()
     
     # Run analysis button
     if st.button("🚀 Run Comprehensive Analysis", type="primary", use_container_width=True):
@@ -498,14 +567,12 @@ def show_comprehensive_analysis():
                 status_text.info("🔄 Step 1/3: Fetching campaign data from Google Ads API...")
                 
                 # We need to fetch data first to show progress
-                from comprehensive_data_fetcher import fetch_comprehensive_campaign_data, format_campaign_data_for_prompt
-                api_call_counter = {'count': 0}
-                data = fetch_comprehensive_campaign_data(
+                from comprehensive_data_fetcher import format_campaign_data_for_prompt
+                data = _campaign_data(
                     st.session_state.client,
                     selected_account_id,
-                    campaign_id=selected_campaign_id,
-                    date_range_days=date_range,
-                    api_call_counter=api_call_counter
+                    selected_campaign_id,
+                    date_range
                 )
                 
                 if not data['campaigns']:
@@ -643,6 +710,36 @@ def _detect_and_save_changes(results):
         else:
             st.error("❌ Failed to save changes to changelog.")
 
+@st.cache_data(ttl=1800, max_entries=16, show_spinner=False)
+def _analysis_pdf_bytes(recommendations, account_name, campaign_name, date_range):
+    """Render the analysis PDF, cached so repeat downloads of the same report skip ReportLab.
+    
+    Raises when the PDF cannot be built so that a failed attempt is not cached.
+    """
+    from real_estate_analyzer import create_pdf_report
+    import io
+    
+    # ReportLab writes straight into memory; no temp file round trip
+    buffer = io.BytesIO()
+    if not create_pdf_report(recommendations, account_name, campaign_name, date_range, buffer):
+        raise RuntimeError("Failed to create PDF")
+    return buffer.getvalue()
+
+# st.fragment reruns only the decorated function when one of its widgets is used
+# (st.experimental_fragment before Streamlit 1.37); older versions get a normal full rerun
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+@_fragment
+def _analysis_export_options():
+    """PDF and Drive export buttons for the stored analysis, isolated from full-page reruns."""
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("💾 Save to PDF", use_container_width=True, key="save_pdf_analysis_stored"):
+            _save_analysis_to_pdf()
+    with col2:
+        if st.button("📤 Upload to Google Drive", use_container_width=True, key="upload_drive_analysis_stored"):
+            _upload_analysis_to_drive()
+
 def _save_analysis_to_pdf():
     """Helper function to save analysis to PDF."""
     if 'analysis_results' not in st.session_state:
@@ -654,35 +751,30 @@ def _save_analysis_to_pdf():
     campaign_name = results['campaign_display'].split(" (")[0] if results['campaign_display'] and results['campaign_display'] != "All Campaigns" else "All Campaigns"
     
     try:
-        from real_estate_analyzer import create_pdf_report
-        import tempfile
-        import os
         from datetime import datetime
         
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
-        temp_filepath = temp_file.name
-        temp_file.close()
-        
-        if create_pdf_report(
-            results['recommendations'],
-            account_name,
-            campaign_name,
-            results['date_range'],
-            temp_filepath
-        ):
-            with open(temp_filepath, 'rb') as f:
-                st.download_button(
-                    label="📥 Download PDF",
-                    data=f.read(),
-                    file_name=f"{account_name}_{campaign_name}_Analysis_{datetime.now().strftime('%Y%m%d')}.pdf",
-                    mime="application/pdf",
-                    use_container_width=True,
-                    key=f"download_pdf_{datetime.now().timestamp()}"
-                )
-            os.unlink(temp_filepath)
-            st.success("✅ PDF created successfully! Click the download button above.")
-        else:
+        try:
+            pdf_bytes = _analysis_pdf_bytes(
+                results['recommendations'],
+                account_name,
+                campaign_name,
+                results['date_range']
+            )
+        except RuntimeError:
             st.error("❌ Failed to create PDF")
+            return
+        
+        # One timestamp for both the file name and the widget key
+        now = datetime.now()
+        st.download_button(
+            label="📥 Download PDF",
+            data=pdf_bytes,
+            file_name=f"{account_name}_{campaign_name}_Analysis_{now.strftime('%Y%m%d')}.pdf",
+            mime="application/pdf",
+            use_container_width=True,
+            key=f"download_pdf_{now.timestamp()}"
+        )
+        st.success("✅ PDF created successfully! Click the download button above.")
     except Exception as e:
         st.error(f"❌ Error creating PDF: {str(e)}")
         import traceback
@@ -714,27 +806,28 @@ def _upload_analysis_to_drive():
     campaign_name = results['campaign_display'].split(" (")[0] if results['campaign_display'] and results['campaign_display'] != "All Campaigns" else "All Campaigns"
     
     try:
-        from real_estate_analyzer import create_pdf_report, upload_to_drive, get_drive_service
+        from real_estate_analyzer import upload_to_drive, get_drive_service
         import tempfile
         import os
         from datetime import datetime
         
-        # Create temporary PDF
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
-        temp_filepath = temp_file.name
-        temp_file.close()
-        
-        # Generate PDF
-        if not create_pdf_report(
-            results['recommendations'],
-            account_name,
-            campaign_name,
-            results['date_range'],
-            temp_filepath
-        ):
+        # Reuse the PDF rendered for download when it is still cached
+        try:
+            pdf_bytes = _analysis_pdf_bytes(
+                results['recommendations'],
+                account_name,
+                campaign_name,
+                results['date_range']
+            )
+        except RuntimeError:
             st.error("❌ Failed to create PDF for upload")
             return
         
+        # Drive uploads read from a file path
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
+            temp_file.write(pdf_bytes)
+        temp_filepath = temp_file.name
+        
         # Get Drive service
         drive_service = get_drive_service()
         if not drive_service:
@@ -788,7 +881,7 @@ def show_ad_copy_optimization():
         mcc_id = os.getenv("GOOGLE_ADS_CUSTOMER_ID")
         if mcc_id:
             try:
-                accounts = list_customer_accounts(st.session_state.client, mcc_id)
+                accounts = _cached_customer_accounts(st.session_state.client, mcc_id)
                 account_options = {f"{acc['descriptive_name']} ({acc['customer_id']})": acc['customer_id'] for acc in accounts}
                 selected_account_display = st.selectbox("Select Account", list(account_options.keys()))
                 selected_account_id = account_options[selected_account_display]
@@ -801,8 +894,7 @@ def show_ad_copy_optimization():
     with col2:
         if selected_account_id:
             try:
-                from account_manager import list_campaigns
-                campaigns = list_campaigns(st.session_state.client, selected_account_id)
+                campaigns = _cached_campaigns(st.session_state.client, selected_account_id)
                 campaign_options = {f"{camp['campaign_name']} (ID: {camp['campaign_id']})": camp['campaign_id'] for camp in campaigns}
                 campaign_options["All Campaigns"] = None
                 selected_campaign_display = st.selectbox("Select Campaign", list(campaign_options.keys()))
@@ -824,12 +916,23 @@ def show_ad_copy_optimization():
         
         with st.spinner("🤖 Claude is analyzing your ad copy..."):
             try:
+                data = _campaign_data(
+                    st.session_state.client,
+                    selected_account_id,
+                    selected_campaign_id,
+                    date_range
+                )
+                if not data['campaigns']:
+                    st.error("No campaign data found for the selected account/campaign.")
+                    return
+                
                 recommendations = st.session_state.analyzer.analyze(
                     customer_id=selected_account_id,
                     campaign_id=selected_campaign_id,
                     date_range_days=date_range,
                     optimization_goals=None,
-                    prompt_type='ad_copy'
+                    prompt_type='ad_copy',
+                    pre_fetched_data=data
                 )
                 
                 # Store results in session state
@@ -895,13 +998,15 @@ def _save_ad_copy_to_pdf():
             temp_filepath
         ):
             with open(temp_filepath, 'rb') as f:
+                # One timestamp for both the file name and the widget key
+                now = datetime.now()
                 st.download_button(
                     label="📥 Download PDF",
                     data=f.read(),
-                    file_name=f"{account_name}_{campaign_name}_AdCopy_{datetime.now().strftime('%Y%m%d')}.pdf",
+                    file_name=f"{account_name}_{campaign_name}_AdCopy_{now.strftime('%Y%m%d')}.pdf",
                     mime="application/pdf",
                     use_container_width=True,
-                    key=f"download_ad_copy_{datetime.now().timestamp()}"
+                    key=f"download_ad_copy_{now.timestamp()}"
                 )
             os.unlink(temp_filepath)
             st.success("✅ PDF created successfully! Click the download button above.")
@@ -984,6 +1089,55 @@ def _upload_ad_copy_to_drive():
         import traceback
         st.code(traceback.format_exc())
 
+# Patterns used by _format_biweekly_preview()
+_BIWEEKLY_BULLET_SECTION_RE = re.compile(r'^\*\*?(What This Means|What We\'re Optimizing|Next Steps)', re.IGNORECASE)
+_BIWEEKLY_HEADER_RE = re.compile(r'^\*\*?[A-Z]')
+_BIWEEKLY_BULLET_SPLIT_RE = re.compile(r'(•\s+)')
+
+def _format_biweekly_preview(report_content):
+    """Format a biweekly report for the preview so each bullet point renders on its own line."""
+    # Split content by sections and format bullets
+    # For sections with bullets, ensure each bullet is on its own line
+    # Pattern: Find bullets that are on the same line and separate them
+    lines = report_content.split('\n')
+    formatted_lines = []
+    in_bullet_section = False
+    
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        # Detect bullet sections
+        if _BIWEEKLY_BULLET_SECTION_RE.match(stripped):
+            in_bullet_section = True
+            formatted_lines.append(line)
+            continue
+        # Detect end of bullet section (next section header or blank line followed by header)
+        if stripped and not stripped.startswith('•') and not stripped.startswith('-') and _BIWEEKLY_HEADER_RE.match(stripped):
+            in_bullet_section = False
+            formatted_lines.append(line)
+            continue
+        
+        if in_bullet_section and stripped:
+            # If line contains multiple bullets, split them
+            if '•' in stripped and stripped.count('•') > 1:
+                # Split by bullet and add each on new line
+                parts = _BIWEEKLY_BULLET_SPLIT_RE.split(stripped)
+                for j in range(1, len(parts), 2):
+                    if j+1 < len(parts):
+                        bullet_text = parts[j] + parts[j+1].strip()
+                        formatted_lines.append(bullet_text)
+                        formatted_lines.append('')  # Add blank line after each bullet
+            else:
+                formatted_lines.append(line)
+                # Add blank line after bullet if not already present
+                if (stripped.startswith('•') or stripped.startswith('-')) and i+1 < len(lines):
+                    next_line = lines[i+1].strip() if i+1 < len(lines) else ''
+                    if next_line and (next_line.startswith('•') or next_line.startswith('-')):
+                        formatted_lines.append('')  # Add blank line between bullets
+        else:
+            formatted_lines.append(line)
+    
+    return '\n'.join(formatted_lines)
+
 def show_biweekly_reports():
     """Biweekly reports page."""
     st.header("📄 Biweekly Client Reports")
@@ -996,7 +1150,7 @@ def show_biweekly_reports():
         mcc_id = os.getenv("GOOGLE_ADS_CUSTOMER_ID")
         if mcc_id:
             try:
-                accounts = list_customer_accounts(st.session_state.client, mcc_id)
+                accounts = _cached_customer_accounts(st.session_state.client, mcc_id)
                 account_options = {f"{acc['descriptive_name']} ({acc['customer_id']})": acc['customer_id'] for acc in accounts}
                 selected_account_display = st.selectbox("Select Account", list(account_options.keys()), key="biweekly_account")
                 selected_account_id = account_options[selected_account_display]
@@ -1009,8 +1163,7 @@ def show_biweekly_reports():
     with col2:
         if selected_account_id:
             try:
-                from account_manager import list_campaigns
-                campaigns = list_campaigns(st.session_state.client, selected_account_id)
+                campaigns = _cached_campaigns(st.session_state.client, selected_account_id)
                 campaign_options = {f"{camp['campaign_name']} (ID: {camp['campaign_id']})": camp['campaign_id'] for camp in campaigns}
                 campaign_options["All Campaigns"] = None
                 selected_campaign_display = st.selectbox("Select Campaign", list(campaign_options.keys()), key="biweekly_campaign")
@@ -1033,12 +1186,23 @@ def show_biweekly_reports():
         
         with st.spinner("🤖 Claude is generating your biweekly report..."):
             try:
+                data = _campaign_data(
+                    st.session_state.client,
+                    selected_account_id,
+                    selected_campaign_id,
+                    date_range
+                )
+                if not data['campaigns']:
+                    st.error("No campaign data found for the selected account/campaign.")
+                    return
+                
                 report_content = st.session_state.analyzer.analyze(
                     customer_id=selected_account_id,
                     campaign_id=selected_campaign_id,
                     date_range_days=date_range,
                     optimization_goals=None,
-                    prompt_type='biweekly_report'
+                    prompt_type='biweekly_report',
+                    pre_fetched_data=data
                 )
                 
                 # Store results in session state
@@ -1062,51 +1226,8 @@ def show_biweekly_reports():
         results = st.session_state['biweekly_results']
         st.markdown("---")
         st.markdown("### 📄 Biweekly Report Preview")
-        # Format the content to ensure bullet points are on separate lines
-        formatted_content = results['report_content']
-        import re
-        # Split content by sections and format bullets
-        # For sections with bullets, ensure each bullet is on its own line
-        # Pattern: Find bullets that are on the same line and separate them
-        lines = formatted_content.split('\n')
-        formatted_lines = []
-        in_bullet_section = False
-        
-        for i, line in enumerate(lines):
-            stripped = line.strip()
-            # Detect bullet sections
-            if re.match(r'^\*\*?(What This Means|What We\'re Optimizing|Next Steps)', stripped, re.IGNORECASE):
-                in_bullet_section = True
-                formatted_lines.append(line)
-                continue
-            # Detect end of bullet section (next section header or blank line followed by header)
-            if stripped and not stripped.startswith('•') and not stripped.startswith('-') and re.match(r'^\*\*?[A-Z]', stripped):
-                in_bullet_section = False
-                formatted_lines.append(line)
-                continue
-            
-            if in_bullet_section and stripped:
-                # If line contains multiple bullets, split them
-                if '•' in stripped and stripped.count('•') > 1:
-                    # Split by bullet and add each on new line
-                    parts = re.split(r'(•\s+)', stripped)
-                    for j in range(1, len(parts), 2):
-                        if j+1 < len(parts):
-                            bullet_text = parts[j] + parts[j+1].strip()
-                            formatted_lines.append(bullet_text)
-                            formatted_lines.append('')  # Add blank line after each bullet
-                else:
-                    formatted_lines.append(line)
-                    # Add blank line after bullet if not already present
-                    if (stripped.startswith('•') or stripped.startswith('-')) and i+1 < len(lines):
-                        next_line = lines[i+1].strip() if i+1 < len(lines) else ''
-                        if next_line and (next_line.startswith('•') or next_line.startswith('-')):
-                            formatted_lines.append('')  # Add blank line between bullets
-            else:
-                formatted_lines.append(line)
-        
-        formatted_content = '\n'.join(formatted_lines)
-        st.markdown(formatted_content)
+        # Put bullet points on separate lines
+        st.markdown(_format_biweekly_preview(results['report_content']))
         
         # Save options
         st.markdown("---")
@@ -1152,13 +1273,15 @@ def _save_biweekly_to_pdf():
                 # Check if file was actually created
                 if os.path.exists(temp_filepath) and os.path.getsize(temp_filepath) > 0:
                     with open(temp_filepath, 'rb') as f:
+                        # One timestamp for both the file name and the widget key
+                        now = datetime.now()
                         st.download_button(
                             label="📥 Download PDF",
                             data=f.read(),
-                            file_name=f"{account_name}_BiweeklyReport_{datetime.now().strftime('%Y%m%d')}.pdf",
+                            file_name=f"{account_name}_BiweeklyReport_{now.strftime('%Y%m%d')}.pdf",
                             mime="application/pdf",
                             use_container_width=True,
-                            key=f"download_biweekly_{datetime.now().timestamp()}"
+                            key=f"download_biweekly_{now.timestamp()}"
                         )
                     os.unlink(temp_filepath)
                     st.success("✅ PDF created successfully! Click the download button above.")
@@ -1341,13 +1464,15 @@ def _save_qa_to_pdf():
         # Use generic names
         if create_qa_chat_pdf(st.session_state.qa_messages, "Q&A Session", "Claude Chat", temp_filepath):
             with open(temp_filepath, 'rb') as f:
+                # One timestamp for both the file name and the widget key
+                now = datetime.now()
                 st.download_button(
                     label="📥 Download PDF",
                     data=f.read(),
-                    file_name=f"Claude_QA_Session_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
+                    file_name=f"Claude_QA_Session_{now.strftime('%Y%m%d_%H%M%S')}.pdf",
                     mime="application/pdf",
                     use_container_width=True,
-                    key=f"download_qa_{datetime.now().timestamp()}"
+                    key=f"download_qa_{now.timestamp()}"
                 )
             os.unlink(temp_filepath)
             st.success("✅ PDF created successfully! Click the download button above.")
@@ -1420,8 +1545,71 @@ def _upload_qa_to_drive():
         import traceback
         st.code(traceback.format_exc())
 
+# Keyword Planner competition level -> badge shown in the keyword research tables
+COMPETITION_BADGES = {
+    'LOW': "🟢 LOW",
+    'MEDIUM': "🟡 MEDIUM",
+    'HIGH': "🔴 HIGH"
+}
+UNKNOWN_COMPETITION_BADGE = "⚪ UNKNOWN"
+
+# Labels and number formats for the keyword research tables, applied by st.dataframe at render time
+KEYWORD_TABLE_COLUMNS = ["keyword_text", "avg_monthly_searches", "competition", "low_top_of_page_bid", "high_top_of_page_bid"]
+KEYWORD_TABLE_COLUMN_CONFIG = {
+    "keyword_text": st.column_config.TextColumn("Keyword"),
+    "avg_monthly_searches": st.column_config.NumberColumn("Monthly Searches", format="%d"),
+    "competition": st.column_config.TextColumn("Competition"),
+    "low_top_of_page_bid": st.column_config.NumberColumn("Low Bid", format="$%.2f"),
+    "high_top_of_page_bid": st.column_config.NumberColumn("High Bid", format="$%.2f")
+}
+
+def _show_keyword_table(keywords):
+    """Render Keyword Planner results as a table, keeping the numeric columns numeric (and sortable)."""
+    import pandas as pd
+    
+    df = pd.DataFrame(keywords)
+    df['competition'] = df['competition'].map(COMPETITION_BADGES).fillna(UNKNOWN_COMPETITION_BADGE)
+    st.dataframe(
+        df,
+        use_container_width=True,
+        hide_index=True,
+        column_order=KEYWORD_TABLE_COLUMNS,
+        column_config=KEYWORD_TABLE_COLUMN_CONFIG
+    )
+
+def _keyword_research_csv(planner_data):
+    """Build the CSV export of seed and related keywords from Keyword Planner results.
+    
+    Columns are filled a whole list at a time rather than assembling one dict per keyword.
+    """
+    import pandas as pd
+    
+    def _column(df, name, default):
+        """Return the column with gaps filled, or the default when the column is missing."""
+        return df[name].fillna(default) if name in df else default
+    
+    frames = []
+    for keyword_type, key in (("Seed Keyword", 'keywords'), ("Related Keyword", 'related_keywords')):
+        if not planner_data.get(key):
+            continue
+        df = pd.DataFrame(planner_data[key])
+        frames.append(pd.DataFrame({
+            "Type": keyword_type,
+            "Keyword": df['keyword_text'],
+            "Monthly Searches": _column(df, 'avg_monthly_searches', 0),
+            "Competition": _column(df, 'competition', 'UNKNOWN'),
+            "Low Bid": _column(df, 'low_top_of_page_bid', 0),
+            "High Bid": _column(df, 'high_top_of_page_bid', 0)
+        }))
+    
+    df_export = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return df_export.to_csv(index=False)
+
 def show_keyword_research():
     """Keyword Research page."""
+    # pandas is only needed for this page's tables, so keep it off app startup
+    import pandas as pd
+    
     st.header("🔍 Keyword Research")
     st.markdown("Research keywords, competition, and search volume using Google Keyword Planner API.")
     
@@ -1438,7 +1626,7 @@ def show_keyword_research():
     col1, col2 = st.columns(2)
     with col1:
         try:
-            accounts = list_customer_accounts(st.session_state.client)
+            accounts = _cached_customer_accounts(st.session_state.client)
             if accounts:
                 account_options = {acc['descriptive_name']: acc['customer_id'] for acc in accounts}
                 selected_account_name = st.selectbox(
@@ -1460,27 +1648,10 @@ def show_keyword_research():
     with col2:
         if selected_account_id:
             try:
-                campaigns = []
-                ga_service = st.session_state.client.get_service("GoogleAdsService")
-                customer_id_numeric = selected_account_id.replace("-", "")
-                query = """
-                    SELECT
-                        campaign.id,
-                        campaign.name,
-                        campaign.status
-                    FROM campaign
-                    WHERE campaign.status != 'REMOVED'
-                    ORDER BY campaign.name
-                """
-                response = ga_service.search(customer_id=customer_id_numeric, query=query)
-                for row in response:
-                    campaigns.append({
-                        'id': row.campaign.id,
-                        'name': row.campaign.name
-                    })
+                campaigns = _cached_campaigns(st.session_state.client, selected_account_id)
                 
                 if campaigns:
-                    campaign_options = {f"{c['name']} (ID: {c['id']})": c['id'] for c in campaigns}
+                    campaign_options = {f"{c['campaign_name']} (ID: {c['campaign_id']})": c['campaign_id'] for c in campaigns}
                     selected_campaign_display = st.selectbox(
                         "Select Campaign",
                         ["None"] + list(campaign_options.keys()),
@@ -1621,14 +1792,7 @@ def show_keyword_research():
                     competition = kw_info.get('competition', 'UNKNOWN')
                     
                     # Competition badge
-                    if competition == 'LOW':
-                        comp_badge = "🟢 LOW"
-                    elif competition == 'MEDIUM':
-                        comp_badge = "🟡 MEDIUM"
-                    elif competition == 'HIGH':
-                        comp_badge = "🔴 HIGH"
-                    else:
-                        comp_badge = "⚪ UNKNOWN"
+                    comp_badge = COMPETITION_BADGES.get(competition, UNKNOWN_COMPETITION_BADGE)
                     
                     # Checkbox for selection
                     if st.checkbox(
@@ -1852,71 +2016,14 @@ Format your response clearly with sections for each analysis area. Be specific a
         if planner_data.get('keywords'):
             st.markdown("#### Seed Keywords Analysis")
             
-            # Prepare data for table
-            keywords_table_data = []
-            for kw in planner_data['keywords']:
-                competition_badge = ""
-                if kw.get('competition') == 'LOW':
-                    competition_badge = "🟢 LOW"
-                elif kw.get('competition') == 'MEDIUM':
-                    competition_badge = "🟡 MEDIUM"
-                elif kw.get('competition') == 'HIGH':
-                    competition_badge = "🔴 HIGH"
-                else:
-                    competition_badge = "⚪ UNKNOWN"
-                
-                bid_range = ""
-                if kw.get('low_top_of_page_bid') and kw.get('high_top_of_page_bid'):
-                    bid_range = f"${kw['low_top_of_page_bid']:.2f} - ${kw['high_top_of_page_bid']:.2f}"
-                elif kw.get('low_top_of_page_bid'):
-                    bid_range = f"${kw['low_top_of_page_bid']:.2f}+"
-                else:
-                    bid_range = "N/A"
-                
-                keywords_table_data.append({
-                    "Keyword": kw['keyword_text'],
-                    "Monthly Searches": f"{kw.get('avg_monthly_searches', 0):,}" if kw.get('avg_monthly_searches') else "N/A",
-                    "Competition": competition_badge,
-                    "Suggested Bid Range": bid_range
-                })
-            
-            df_keywords = pd.DataFrame(keywords_table_data)
-            st.dataframe(df_keywords, use_container_width=True, hide_index=True)
+            _show_keyword_table(planner_data['keywords'])
         
         # Display related keywords
         if planner_data.get('related_keywords'):
             st.markdown("#### Related Keyword Opportunities")
             st.markdown(f"Found {len(planner_data['related_keywords'])} related keywords. Showing top {min(max_related_keywords, len(planner_data['related_keywords']))}:")
             
-            related_table_data = []
-            for kw in planner_data['related_keywords'][:max_related_keywords]:
-                competition_badge = ""
-                if kw.get('competition') == 'LOW':
-                    competition_badge = "🟢 LOW"
-                elif kw.get('competition') == 'MEDIUM':
-                    competition_badge = "🟡 MEDIUM"
-                elif kw.get('competition') == 'HIGH':
-                    competition_badge = "🔴 HIGH"
-                else:
-                    competition_badge = "⚪ UNKNOWN"
-                
-                bid_range = ""
-                if kw.get('low_top_of_page_bid') and kw.get('high_top_of_page_bid'):
-                    bid_range = f"${kw['low_top_of_page_bid']:.2f} - ${kw['high_top_of_page_bid']:.2f}"
-                elif kw.get('low_top_of_page_bid'):
-                    bid_range = f"${kw['low_top_of_page_bid']:.2f}+"
-                else:
-                    bid_range = "N/A"
-                
-                related_table_data.append({
-                    "Keyword": kw['keyword_text'],
-                    "Monthly Searches": f"{kw.get('avg_monthly_searches', 0):,}" if kw.get('avg_monthly_searches') else "N/A",
-                    "Competition": competition_badge,
-                    "Suggested Bid Range": bid_range
-                })
-            
-            df_related = pd.DataFrame(related_table_data)
-            st.dataframe(df_related, use_container_width=True, hide_index=True)
+            _show_keyword_table(planner_data['related_keywords'][:max_related_keywords])
         
         # Display Claude recommendations
         if st.session_state.keyword_research_claude_recommendations:
@@ -1932,33 +2039,7 @@ Format your response clearly with sections for each analysis area. Be specific a
         with col1:
             if st.button("📥 Download as CSV", use_container_width=True):
                 try:
-                    import io
-                    
-                    # Combine all keywords
-                    all_keywords = []
-                    if planner_data.get('keywords'):
-                        for kw in planner_data['keywords']:
-                            all_keywords.append({
-                                "Type": "Seed Keyword",
-                                "Keyword": kw['keyword_text'],
-                                "Monthly Searches": kw.get('avg_monthly_searches', 0) or 0,
-                                "Competition": kw.get('competition', 'UNKNOWN'),
-                                "Low Bid": kw.get('low_top_of_page_bid', 0) or 0,
-                                "High Bid": kw.get('high_top_of_page_bid', 0) or 0
-                            })
-                    if planner_data.get('related_keywords'):
-                        for kw in planner_data['related_keywords']:
-                            all_keywords.append({
-                                "Type": "Related Keyword",
-                                "Keyword": kw['keyword_text'],
-                                "Monthly Searches": kw.get('avg_monthly_searches', 0) or 0,
-                                "Competition": kw.get('competition', 'UNKNOWN'),
-                                "Low Bid": kw.get('low_top_of_page_bid', 0) or 0,
-                                "High Bid": kw.get('high_top_of_page_bid', 0) or 0
-                            })
-                    
-                    df_export = pd.DataFrame(all_keywords)
-                    csv = df_export.to_csv(index=False)
+                    csv = _keyword_research_csv(planner_data)
                     st.download_button(
                         label="⬇️ Download CSV",
                         data=csv,
@@ -1975,31 +2056,8 @@ Format your response clearly with sections for each analysis area. Be specific a
                     import tempfile
                     
                     # Create CSV file
-                    all_keywords = []
-                    if planner_data.get('keywords'):
-                        for kw in planner_data['keywords']:
-                            all_keywords.append({
-                                "Type": "Seed Keyword",
-                                "Keyword": kw['keyword_text'],
-                                "Monthly Searches": kw.get('avg_monthly_searches', 0) or 0,
-                                "Competition": kw.get('competition', 'UNKNOWN'),
-                                "Low Bid": kw.get('low_top_of_page_bid', 0) or 0,
-                                "High Bid": kw.get('high_top_of_page_bid', 0) or 0
-                            })
-                    if planner_data.get('related_keywords'):
-                        for kw in planner_data['related_keywords']:
-                            all_keywords.append({
-                                "Type": "Related Keyword",
-                                "Keyword": kw['keyword_text'],
-                                "Monthly Searches": kw.get('avg_monthly_searches', 0) or 0,
-                                "Competition": kw.get('competition', 'UNKNOWN'),
-                                "Low Bid": kw.get('low_top_of_page_bid', 0) or 0,
-                                "High Bid": kw.get('high_top_of_page_bid', 0) or 0
-                            })
-                    
-                    df_export = pd.DataFrame(all_keywords)
                     temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.csv', mode='w')
-                    df_export.to_csv(temp_file.name, index=False)
+                    temp_file.write(_keyword_research_csv(planner_data))
                     temp_file.close()
                     
                     # Upload to Google Drive
@@ -2067,6 +2125,9 @@ def show_create_account():
                         )
                         
                         if new_account_id:
+                            # Make the new account show up on the Create Campaign page and account selectors
+                            get_sub_accounts.clear()
+                            _cached_customer_accounts.clear()
                             st.success(f"✅ Sub-account created successfully!")
                             st.markdown(f"**Account ID:** `{new_account_id}`")
                             st.info("💡 The account has been created. The client will need to set up their own payment method in Google Ads.")
@@ -2129,6 +2190,8 @@ def show_create_campaign():
                         )
                         
                         if campaign_id:
+                            # Make the new campaign show up in the campaign selectors
+                            _cached_campaigns.clear()
                             st.success(f"✅ Campaign created successfully!")
                             st.markdown(f"**Campaign ID:** `{campaign_id}`")
                             st.info("💡 The campaign has been created in PAUSED status. You can enable it after adding ad groups, ads, and keywords.")
@@ -7,7 +7,10 @@ Supports token generation, refresh, and revocation.
 
 import os
 import json
+import logging
 import tempfile
+import threading
+import weakref
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
@@ -16,6 +19,8 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Try to import streamlit for Cloud deployment
 try:
     import streamlit as st
@@ -30,6 +35,33 @@ SCOPES = [
     'https://www.googleapis.com/auth/drive'  # For creating folders and managing Drive files
 ]
 
+# Service clients per GoogleAdsClient, see get_service()
+_service_cache = weakref.WeakKeyDictionary()
+_service_cache_lock = threading.Lock()
+
+def get_service(client, name):
+    """
+    Get a Google Ads service client, reusing one per client and service name.
+    
+    GoogleAdsClient.get_service() opens a new gRPC channel (and TLS session)
+    on every call, so repeated calls would never reuse a connection. This keeps
+    the first service client and its channel for later calls.
+    
+    Args:
+        client: GoogleAdsClient instance
+        name: Service name, e.g. "GoogleAdsService"
+    
+    Returns:
+        Service client for the requested service
+    """
+    with _service_cache_lock:
+        services = _service_cache.setdefault(client, {})
+        service = services.get(name)
+        if service is None:
+            service = client.get_service(name)
+            services[name] = service
+    return service
+
 def authenticate():
     """Authenticate and get credentials for Google Ads API."""
     creds = None
@@ -65,13 +97,12 @@ def authenticate():
                 temp_token.close()
                 token_file = temp_token.name
                 
-                if STREAMLIT_AVAILABLE:
-                    # Debug: verify token was loaded
-                    expiry = token_data.get('expiry', 'unknown')
-                    has_refresh = 'refresh_token' in token_data and token_data['refresh_token']
-                    st.success(f"✅ Loaded TOKEN_JSON from Streamlit secrets")
-                    st.info(f"   Expiry: {expiry}")
-                    st.info(f"   Has refresh_token: {has_refresh}")
+                # Debug: verify token was loaded (log only, not rendered in the UI)
+                logger.debug(
+                    "Loaded TOKEN_JSON from Streamlit secrets (expiry=%s, has_refresh_token=%s)",
+                    token_data.get('expiry', 'unknown'),
+                    bool(token_data.get('refresh_token'))
+                )
         except Exception as e:
             # Fall back to local file if secrets fail
             if STREAMLIT_AVAILABLE:
@@ -257,12 +288,6 @@ def get_client():
             st.error("❌ GOOGLE_ADS_DEVELOPER_TOKEN is empty. Please check your Streamlit secrets.")
         return None
     
-    # Debug: Show partial token for verification (first 10 chars)
-    if STREAMLIT_AVAILABLE:
-        token_preview = developer_token[:10] + "..." if len(developer_token) > 10 else developer_token
-        # Only show in debug mode or if there's an error
-        # st.info(f"🔍 Debug: Developer token starts with: {token_preview}")
-    
     # CRITICAL: Ensure credentials are valid and refreshed BEFORE creating client
     # The access token must be valid for GoogleAdsClient to work
     if not creds.valid:
@@ -330,7 +355,7 @@ def get_client():
         # This will fail immediately if there's an auth issue rather than later
         try:
             # Try to get customer info - this is a lightweight call that verifies auth
-            customer_service = client.get_service("CustomerService")
+            customer_service = get_service(client, "CustomerService")
             # Don't actually call it, just verify the service is available
             # The actual API call will happen when needed
         except Exception as test_error:
@@ -7,350 +7,412 @@ for comprehensive Claude analysis.
 
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
-import pandas as pd
+from authenticate import get_service
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+import heapq
 import json
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
-def fetch_comprehensive_campaign_data(client, customer_id, campaign_id=None, date_range_days=30, api_call_counter=None):
-    """
-    Fetch comprehensive campaign data including all metrics needed for analysis.
-    
-    Args:
-        client: Google Ads API client
-        customer_id: Customer account ID (format: 123-456-7890)
-        campaign_id: Specific campaign ID (None for all campaigns)
-        date_range_days: Number of days to analyze
-        api_call_counter: Optional dict to track API call count (will increment 'count' key)
+# Bidding strategy types treated as smart bidding
+SMART_BIDDING_STRATEGIES = frozenset({
+    'TARGET_CPA', 'TARGET_ROAS', 'MAXIMIZE_CONVERSIONS', 'MAXIMIZE_CONVERSION_VALUE', 'MAXIMIZE_CLICKS'
+})
+
+# Report query templates, filled in with the date range and optional campaign filter
+
+# Campaign-level data, including conversion metrics and bidding strategy
+_CAMPAIGN_QUERY_TMPL = """
+    SELECT
+        campaign.id,
+        campaign.name,
+        campaign.status,
+        campaign.start_date,
+        campaign.end_date,
+        campaign.advertising_channel_type,
+        campaign_budget.amount_micros,
+        campaign_budget.period,
+        campaign.bidding_strategy_type,
+        metrics.cost_micros,
+        metrics.impressions,
+        metrics.clicks,
+        metrics.ctr,
+        metrics.average_cpc,
+        metrics.conversions,
+        metrics.all_conversions_value,
+        metrics.search_impression_share,
+        metrics.search_budget_lost_impression_share,
+        metrics.search_rank_lost_impression_share
+    FROM campaign
+    WHERE campaign.status != 'REMOVED'
+        AND segments.date BETWEEN '{start_date}' 
+        AND '{end_date}'
+        {campaign_filter}
+"""
+
+# Ad group performance
+_AD_GROUP_QUERY_TMPL = """
+    SELECT
+        ad_group.id,
+        ad_group.name,
+        campaign.id,
+        campaign.name,
+        metrics.cost_micros,
+        metrics.impressions,
+        metrics.clicks,
+        metrics.ctr,
+        metrics.average_cpc,
+        metrics.conversions,
+        metrics.all_conversions_value
+    FROM ad_group
+    WHERE ad_group.status != 'REMOVED'
+        AND segments.date BETWEEN '{start_date}' 
+        AND '{end_date}'
+        {campaign_filter}
+"""
+
+# Ad performance with responsive search ad assets
+_AD_QUERY_TMPL = """
+    SELECT
+        ad_group_ad.ad.id,
+        ad_group_ad.ad.type,
+        ad_group_ad.ad.responsive_search_ad.headlines,
+        ad_group_ad.ad.responsive_search_ad.descriptions,
+        ad_group_ad.status,
+        ad_group.name,
+        campaign.name,
+        metrics.impressions,
+        metrics.clicks,
+        metrics.ctr,
+        metrics.cost_micros
+    FROM ad_group_ad
+    WHERE ad_group_ad.status != 'REMOVED'
+        AND segments.date BETWEEN '{start_date}' 
+        AND '{end_date}'
+        {campaign_filter}
+"""
+
+# Keyword performance with Quality Score
+_KEYWORD_QUERY_TMPL = """
+    SELECT
+        ad_group_criterion.keyword.text,
+        ad_group_criterion.keyword.match_type,
+        ad_group_criterion.quality_info.quality_score,
+        ad_group_criterion.quality_info.creative_quality_score,
+        ad_group_criterion.quality_info.post_click_quality_score,
+        ad_group_criterion.quality_info.search_predicted_ctr,
+        ad_group.name,
+        campaign.name,
+        metrics.impressions,
+        metrics.clicks,
+        metrics.ctr,
+        metrics.average_cpc,
+        metrics.cost_micros,
+        metrics.conversions,
+        metrics.all_conversions_value,
+        metrics.search_impression_share,
+        metrics.search_rank_lost_impression_share
+    FROM keyword_view
+    WHERE ad_group_criterion.status != 'REMOVED'
+        AND segments.date BETWEEN '{start_date}' 
+        AND '{end_date}'
+        {campaign_filter}
+    ORDER BY metrics.cost_micros DESC
+"""
+
+# Search terms (actual search queries that triggered ads)
+_SEARCH_TERM_QUERY_TMPL = """
+    SELECT
+        search_term_view.search_term,
+        ad_group.id,
+        ad_group.name,
+        campaign.id,
+        campaign.name,
+        metrics.impressions,
+        metrics.clicks,
+        metrics.ctr,
+        metrics.cost_micros,
+        metrics.average_cpc,
+        metrics.conversions,
+        metrics.all_conversions_value
+    FROM search_term_view
+    WHERE segments.date BETWEEN '{start_date}' 
+        AND '{end_date}'
+        {campaign_filter}
+    ORDER BY metrics.cost_micros DESC
+    LIMIT 100
+"""
+
+def _stream_rows(ga_service, customer_id_numeric, query):
+    """Yield report rows via search_stream, which sends the whole result set over one streaming RPC.
     
-    Returns:
-        Dictionary with campaign, ad_group, ad, keyword, and auction data
+    Rows are processed as batches arrive instead of paging through search().
+    API errors surface while iterating.
     """
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=date_range_days)
-    
-    campaign_filter = f"AND campaign.id = {campaign_id}" if campaign_id else ""
-    
-    # Convert customer_id to numeric format (remove dashes) for API
-    customer_id_numeric = customer_id.replace("-", "")
-    
-    try:
-        ga_service = client.get_service("GoogleAdsService")
+    for batch in ga_service.search_stream(customer_id=customer_id_numeric, query=query):
+        yield from batch.results
+
+def _fetch_campaign_rows(ga_service, customer_id_numeric, query):
+    """Run the campaign-level query and return one dict per campaign."""
+    campaign_data = []
+    response = _stream_rows(ga_service, customer_id_numeric, query)
+    for row in response:
+        cost = row.metrics.cost_micros / 1_000_000
+        # Get conversion metrics (using correct field names)
+        # Note: all_conversions_value is already in base currency (dollars), NOT micros
+        conversions = row.metrics.conversions if hasattr(row.metrics, 'conversions') else 0
+        conversion_value = row.metrics.all_conversions_value if hasattr(row.metrics, 'all_conversions_value') else 0
         
-        # 1. Campaign-level data
-        # Including conversion metrics with correct field names and bidding strategy
-        campaign_query = f"""
-            SELECT
-                campaign.id,
-                campaign.name,
-                campaign.status,
-                campaign.start_date,
-                campaign.end_date,
-                campaign.advertising_channel_type,
-                campaign_budget.amount_micros,
-                campaign_budget.period,
-                campaign.bidding_strategy_type,
-                metrics.cost_micros,
-                metrics.impressions,
-                metrics.clicks,
-                metrics.ctr,
-                metrics.average_cpc,
-                metrics.conversions,
-                metrics.all_conversions_value,
-                metrics.search_impression_share,
-                metrics.search_budget_lost_impression_share,
-                metrics.search_rank_lost_impression_share
-            FROM campaign
-            WHERE campaign.status != 'REMOVED'
-                AND segments.date BETWEEN '{start_date.strftime("%Y-%m-%d")}' 
-                AND '{end_date.strftime("%Y-%m-%d")}'
-                {campaign_filter}
-        """
+        # Get bidding strategy information
+        bidding_strategy = row.campaign.bidding_strategy_type.name if hasattr(row.campaign, 'bidding_strategy_type') else 'UNKNOWN'
         
-        campaign_data = []
-        response = ga_service.search(customer_id=customer_id_numeric, query=campaign_query)
-        if api_call_counter is not None:
-            api_call_counter['count'] = api_call_counter.get('count', 0) + 1
+        # Determine if using smart bidding
+        is_smart_bidding = bidding_strategy in SMART_BIDDING_STRATEGIES
+        
+        # Target CPA and Target ROAS - fetch from bidding strategy resource if available
+        target_cpa = None
+        target_roas = None
+        bidding_strategy_id = None
+        
+        # Try to get bidding strategy ID from campaign
+        if hasattr(row.campaign, 'bidding_strategy') and row.campaign.bidding_strategy:
+            bidding_strategy_id = row.campaign.bidding_strategy.split('/')[-1] if '/' in row.campaign.bidding_strategy else row.campaign.bidding_strategy
+        
+        campaign_data.append({
+            'campaign_id': row.campaign.id,
+            'campaign_name': row.campaign.name,
+            'status': row.campaign.status.name,
+            'channel_type': row.campaign.advertising_channel_type.name,
+            'bidding_strategy': bidding_strategy,
+            'bidding_strategy_type': bidding_strategy,  # Alias for snapshot compatibility
+            'is_smart_bidding': is_smart_bidding,
+            'target_cpa': target_cpa,
+            'target_roas': target_roas,
+            'bidding_strategy_id': bidding_strategy_id,
+            'budget': row.campaign_budget.amount_micros / 1_000_000 if row.campaign_budget.amount_micros else 0,
+            'start_date': row.campaign.start_date if hasattr(row.campaign, 'start_date') and row.campaign.start_date else None,
+            'end_date': row.campaign.end_date if hasattr(row.campaign, 'end_date') and row.campaign.end_date else None,
+            'cost': cost,
+            'conversions': conversions,
+            'conversion_value': conversion_value,
+            'impressions': row.metrics.impressions,
+            'clicks': row.metrics.clicks,
+            'ctr': row.metrics.ctr * 100 if row.metrics.ctr else 0,
+            'avg_cpc': row.metrics.average_cpc / 1_000_000 if row.metrics.average_cpc else 0,
+            'conversion_rate': (conversions / row.metrics.clicks * 100) if row.metrics.clicks > 0 else 0,
+            'cost_per_conversion': (cost / conversions) if conversions > 0 else 0,
+            'value_per_conversion': (conversion_value / conversions) if conversions > 0 else 0,
+            'impression_share': row.metrics.search_impression_share * 100 if row.metrics.search_impression_share else 0,
+            'budget_lost_share': row.metrics.search_budget_lost_impression_share * 100 if row.metrics.search_budget_lost_impression_share else 0,
+            'rank_lost_share': row.metrics.search_rank_lost_impression_share * 100 if row.metrics.search_rank_lost_impression_share else 0,
+            'roas': (conversion_value / cost) if cost > 0 else 0
+        })
+    return campaign_data
+
+def _fetch_ad_group_rows(ga_service, customer_id_numeric, query):
+    """Run the ad group query and return one dict per ad group."""
+    ad_group_data = []
+    response = _stream_rows(ga_service, customer_id_numeric, query)
+    for row in response:
+        cost = row.metrics.cost_micros / 1_000_000
+        # Get conversion metrics (using correct field names)
+        # Note: all_conversions_value is already in base currency (dollars), NOT micros
+        conversions = row.metrics.conversions if hasattr(row.metrics, 'conversions') else 0
+        conversion_value = row.metrics.all_conversions_value if hasattr(row.metrics, 'all_conversions_value') else 0
+        
+        ad_group_data.append({
+            'ad_group_id': row.ad_group.id,
+            'ad_group_name': row.ad_group.name,
+            'campaign_id': row.campaign.id,
+            'campaign_name': row.campaign.name,
+            'cost': cost,
+            'conversions': conversions,
+            'conversion_value': conversion_value,
+            'impressions': row.metrics.impressions,
+            'clicks': row.metrics.clicks,
+            'ctr': row.metrics.ctr * 100 if row.metrics.ctr else 0,
+            'avg_cpc': row.metrics.average_cpc / 1_000_000 if row.metrics.average_cpc else 0,
+            'conversion_rate': (conversions / row.metrics.clicks * 100) if row.metrics.clicks > 0 else 0,
+            'cost_per_conversion': (cost / conversions) if conversions > 0 else 0
+        })
+    return ad_group_data
+
+def _fetch_ad_rows(ga_service, customer_id_numeric, query):
+    """Run the ad performance query; returns (rows, complete).
+    
+    If ad-level data is unavailable or the stream breaks, the rows read so far
+    are returned with complete=False.
+    """
+    ad_data = []
+    try:
+        response = _stream_rows(ga_service, customer_id_numeric, query)
         for row in response:
-            cost = row.metrics.cost_micros / 1_000_000
-            # Get conversion metrics (using correct field names)
-            # Note: all_conversions_value is already in base currency (dollars), NOT micros
-            conversions = row.metrics.conversions if hasattr(row.metrics, 'conversions') else 0
-            conversion_value = row.metrics.all_conversions_value if hasattr(row.metrics, 'all_conversions_value') else 0
-            
-            # Get bidding strategy information
-            bidding_strategy = row.campaign.bidding_strategy_type.name if hasattr(row.campaign, 'bidding_strategy_type') else 'UNKNOWN'
-            
-            # Determine if using smart bidding
-            smart_bidding_strategies = ['TARGET_CPA', 'TARGET_ROAS', 'MAXIMIZE_CONVERSIONS', 'MAXIMIZE_CONVERSION_VALUE', 'MAXIMIZE_CLICKS']
-            is_smart_bidding = bidding_strategy in smart_bidding_strategies
-            
-            # Target CPA and Target ROAS - fetch from bidding strategy resource if available
-            target_cpa = None
-            target_roas = None
-            bidding_strategy_id = None
+            headlines = []
+            descriptions = []
             
-            # Try to get bidding strategy ID from campaign
-            if hasattr(row.campaign, 'bidding_strategy') and row.campaign.bidding_strategy:
-                bidding_strategy_id = row.campaign.bidding_strategy.split('/')[-1] if '/' in row.campaign.bidding_strategy else row.campaign.bidding_strategy
+            if hasattr(row.ad_group_ad.ad, 'responsive_search_ad'):
+                rsa = row.ad_group_ad.ad.responsive_search_ad
+                if hasattr(rsa, 'headlines'):
+                    headlines = [h.text for h in rsa.headlines if hasattr(h, 'text')]
+                if hasattr(rsa, 'descriptions'):
+                    descriptions = [d.text for d in rsa.descriptions if hasattr(d, 'text')]
             
-            campaign_data.append({
-                'campaign_id': row.campaign.id,
-                'campaign_name': row.campaign.name,
-                'status': row.campaign.status.name,
-                'channel_type': row.campaign.advertising_channel_type.name,
-                'bidding_strategy': bidding_strategy,
-                'bidding_strategy_type': bidding_strategy,  # Alias for snapshot compatibility
-                'is_smart_bidding': is_smart_bidding,
-                'target_cpa': target_cpa,
-                'target_roas': target_roas,
-                'bidding_strategy_id': bidding_strategy_id,
-                'budget': row.campaign_budget.amount_micros / 1_000_000 if row.campaign_budget.amount_micros else 0,
-                'start_date': row.campaign.start_date if hasattr(row.campaign, 'start_date') and row.campaign.start_date else None,
-                'end_date': row.campaign.end_date if hasattr(row.campaign, 'end_date') and row.campaign.end_date else None,
-                'cost': cost,
-                'conversions': conversions,
-                'conversion_value': conversion_value,
+            # Store ALL headlines and descriptions (not just first few)
+            # For responsive search ads, there can be up to 15 headlines and 4 descriptions
+            ad_data.append({
+                'ad_id': row.ad_group_ad.ad.id,
+                'ad_type': row.ad_group_ad.ad.type.name,
+                'headlines': ' | '.join(headlines),  # ALL headlines (up to 15)
+                'headlines_list': headlines,  # Store as list for easier analysis
+                'descriptions': ' | '.join(descriptions),  # ALL descriptions (up to 4)
+                'descriptions_list': descriptions,  # Store as list for easier analysis
+                'headlines_count': len(headlines),
+                'descriptions_count': len(descriptions),
+                'status': row.ad_group_ad.status.name,
+                'ad_group': row.ad_group.name,
+                'campaign': row.campaign.name,
                 'impressions': row.metrics.impressions,
                 'clicks': row.metrics.clicks,
                 'ctr': row.metrics.ctr * 100 if row.metrics.ctr else 0,
-                'avg_cpc': row.metrics.average_cpc / 1_000_000 if row.metrics.average_cpc else 0,
-                'conversion_rate': (conversions / row.metrics.clicks * 100) if row.metrics.clicks > 0 else 0,
-                'cost_per_conversion': (cost / conversions) if conversions > 0 else 0,
-                'value_per_conversion': (conversion_value / conversions) if conversions > 0 else 0,
-                'impression_share': row.metrics.search_impression_share * 100 if row.metrics.search_impression_share else 0,
-                'budget_lost_share': row.metrics.search_budget_lost_impression_share * 100 if row.metrics.search_budget_lost_impression_share else 0,
-                'rank_lost_share': row.metrics.search_rank_lost_impression_share * 100 if row.metrics.search_rank_lost_impression_share else 0,
-                'roas': (conversion_value / cost) if cost > 0 else 0
+                'conversions': 0,  # Not available in ad-level data for this account type
+                'conversion_value': 0,  # Not available in ad-level data for this account type
+                'cost': row.metrics.cost_micros / 1_000_000
             })
+    except Exception as e:
+        # Some accounts may not have ad-level data accessible
+        return ad_data, False
+    return ad_data, True
+
+def _fetch_keyword_rows(ga_service, customer_id_numeric, query):
+    """Run the keyword query (with Quality Score) and return one dict per keyword."""
+    keyword_data = []
+    response = _stream_rows(ga_service, customer_id_numeric, query)
+    for row in response:
+        # Get conversion metrics (using correct field names)
+        # Note: all_conversions_value is already in base currency (dollars), NOT micros
+        conversions = row.metrics.conversions if hasattr(row.metrics, 'conversions') else 0
+        conversion_value = row.metrics.all_conversions_value if hasattr(row.metrics, 'all_conversions_value') else 0
+        cost = row.metrics.cost_micros / 1_000_000
         
-        # 2. Ad Group data
-        ad_group_query = f"""
-            SELECT
-                ad_group.id,
-                ad_group.name,
-                campaign.id,
-                campaign.name,
-                metrics.cost_micros,
-                metrics.impressions,
-                metrics.clicks,
-                metrics.ctr,
-                metrics.average_cpc,
-                metrics.conversions,
-                metrics.all_conversions_value
-            FROM ad_group
-            WHERE ad_group.status != 'REMOVED'
-                AND segments.date BETWEEN '{start_date.strftime("%Y-%m-%d")}' 
-                AND '{end_date.strftime("%Y-%m-%d")}'
-                {campaign_filter}
-        """
-        
-        ad_group_data = []
-        response = ga_service.search(customer_id=customer_id_numeric, query=ad_group_query)
-        if api_call_counter is not None:
-            api_call_counter['count'] = api_call_counter.get('count', 0) + 1
+        keyword_data.append({
+            'keyword': row.ad_group_criterion.keyword.text,
+            'match_type': row.ad_group_criterion.keyword.match_type.name,
+            'quality_score': row.ad_group_criterion.quality_info.quality_score if hasattr(row.ad_group_criterion, 'quality_info') and row.ad_group_criterion.quality_info.quality_score else 0,
+            'creative_quality': row.ad_group_criterion.quality_info.creative_quality_score.name if hasattr(row.ad_group_criterion, 'quality_info') and hasattr(row.ad_group_criterion.quality_info, 'creative_quality_score') else 'N/A',
+            'post_click_quality': row.ad_group_criterion.quality_info.post_click_quality_score.name if hasattr(row.ad_group_criterion, 'quality_info') and hasattr(row.ad_group_criterion.quality_info, 'post_click_quality_score') else 'N/A',
+            'expected_ctr': row.ad_group_criterion.quality_info.search_predicted_ctr.name if hasattr(row.ad_group_criterion, 'quality_info') and hasattr(row.ad_group_criterion.quality_info, 'search_predicted_ctr') else 'N/A',
+            'ad_group': row.ad_group.name,
+            'campaign': row.campaign.name,
+            'impressions': row.metrics.impressions,
+            'clicks': row.metrics.clicks,
+            'ctr': row.metrics.ctr * 100 if row.metrics.ctr else 0,
+            'avg_cpc': row.metrics.average_cpc / 1_000_000 if row.metrics.average_cpc else 0,
+            'cost': cost,
+            'conversions': conversions,
+            'conversion_value': conversion_value,
+            'conversion_rate': (conversions / row.metrics.clicks * 100) if row.metrics.clicks > 0 else 0,
+            'cost_per_conversion': (cost / conversions) if conversions > 0 else 0,
+            'impression_share': row.metrics.search_impression_share * 100 if row.metrics.search_impression_share else 0,
+            'rank_lost_share': row.metrics.search_rank_lost_impression_share * 100 if row.metrics.search_rank_lost_impression_share else 0
+        })
+    return keyword_data
+
+def _fetch_search_term_rows(ga_service, customer_id_numeric, query):
+    """Run the search term query; returns (rows, complete).
+    
+    If search terms are unavailable or the stream breaks, the rows read so far
+    are returned with complete=False.
+    """
+    search_terms_data = []
+    try:
+        response = _stream_rows(ga_service, customer_id_numeric, query)
         for row in response:
             cost = row.metrics.cost_micros / 1_000_000
-            # Get conversion metrics (using correct field names)
             # Note: all_conversions_value is already in base currency (dollars), NOT micros
             conversions = row.metrics.conversions if hasattr(row.metrics, 'conversions') else 0
             conversion_value = row.metrics.all_conversions_value if hasattr(row.metrics, 'all_conversions_value') else 0
             
-            ad_group_data.append({
+            search_terms_data.append({
+                'search_term': row.search_term_view.search_term,
                 'ad_group_id': row.ad_group.id,
                 'ad_group_name': row.ad_group.name,
                 'campaign_id': row.campaign.id,
                 'campaign_name': row.campaign.name,
-                'cost': cost,
-                'conversions': conversions,
-                'conversion_value': conversion_value,
                 'impressions': row.metrics.impressions,
                 'clicks': row.metrics.clicks,
                 'ctr': row.metrics.ctr * 100 if row.metrics.ctr else 0,
+                'cost': cost,
                 'avg_cpc': row.metrics.average_cpc / 1_000_000 if row.metrics.average_cpc else 0,
+                'conversions': conversions,
+                'conversion_value': conversion_value,
                 'conversion_rate': (conversions / row.metrics.clicks * 100) if row.metrics.clicks > 0 else 0,
                 'cost_per_conversion': (cost / conversions) if conversions > 0 else 0
             })
+    except Exception as e:
+        # Search terms may not be available for all accounts or may require specific permissions
+        return search_terms_data, False
+    return search_terms_data, True
+
+def fetch_comprehensive_campaign_data(client, customer_id, campaign_id=None, date_range_days=30, api_call_counter=None):
+    """
+    Fetch comprehensive campaign data including all metrics needed for analysis.
+    
+    The five report queries are independent, so they run concurrently on a
+    small thread pool instead of one after another.
+    
+    Args:
+        client: Google Ads API client
+        customer_id: Customer account ID (format: 123-456-7890)
+        campaign_id: Specific campaign ID (None for all campaigns)
+        date_range_days: Number of days to analyze
+        api_call_counter: Optional dict to track API call count (will increment 'count' key)
+    
+    Returns:
+        Dictionary with campaign, ad_group, ad, keyword, and auction data. 'incomplete_sections'
+        names the sections ('ads', 'search_terms') that could not be fetched in full.
+    """
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=date_range_days)
+    
+    # int() rejects anything that is not a campaign ID before it reaches the GAQL text
+    query_params = {
+        'start_date': start_date.strftime("%Y-%m-%d"),
+        'end_date': end_date.strftime("%Y-%m-%d"),
+        'campaign_filter': f"AND campaign.id = {int(campaign_id)}" if campaign_id else ""
+    }
+    
+    # Convert customer_id to numeric format (remove dashes) for API
+    customer_id_numeric = customer_id.replace("-", "")
+    
+    try:
+        ga_service = get_service(client, "GoogleAdsService")
         
-        # 3. Ad data (ad performance)
-        ad_query = f"""
-            SELECT
-                ad_group_ad.ad.id,
-                ad_group_ad.ad.type,
-                ad_group_ad.ad.responsive_search_ad.headlines,
-                ad_group_ad.ad.responsive_search_ad.descriptions,
-                ad_group_ad.status,
-                ad_group.name,
-                campaign.name,
-                metrics.impressions,
-                metrics.clicks,
-                metrics.ctr,
-                metrics.cost_micros
-            FROM ad_group_ad
-            WHERE ad_group_ad.status != 'REMOVED'
-                AND segments.date BETWEEN '{start_date.strftime("%Y-%m-%d")}' 
-                AND '{end_date.strftime("%Y-%m-%d")}'
-                {campaign_filter}
-        """
-        
-        ad_data = []
-        try:
-            response = ga_service.search(customer_id=customer_id_numeric, query=ad_query)
-            if api_call_counter is not None:
-                api_call_counter['count'] = api_call_counter.get('count', 0) + 1
-            for row in response:
-                headlines = []
-                descriptions = []
-                
-                if hasattr(row.ad_group_ad.ad, 'responsive_search_ad'):
-                    rsa = row.ad_group_ad.ad.responsive_search_ad
-                    if hasattr(rsa, 'headlines'):
-                        headlines = [h.text for h in rsa.headlines if hasattr(h, 'text')]
-                    if hasattr(rsa, 'descriptions'):
-                        descriptions = [d.text for d in rsa.descriptions if hasattr(d, 'text')]
-                
-                # Store ALL headlines and descriptions (not just first few)
-                # For responsive search ads, there can be up to 15 headlines and 4 descriptions
-                ad_data.append({
-                    'ad_id': row.ad_group_ad.ad.id,
-                    'ad_type': row.ad_group_ad.ad.type.name,
-                    'headlines': ' | '.join(headlines),  # ALL headlines (up to 15)
-                    'headlines_list': headlines,  # Store as list for easier analysis
-                    'descriptions': ' | '.join(descriptions),  # ALL descriptions (up to 4)
-                    'descriptions_list': descriptions,  # Store as list for easier analysis
-                    'headlines_count': len(headlines),
-                    'descriptions_count': len(descriptions),
-                    'status': row.ad_group_ad.status.name,
-                    'ad_group': row.ad_group.name,
-                    'campaign': row.campaign.name,
-                    'impressions': row.metrics.impressions,
-                    'clicks': row.metrics.clicks,
-                    'ctr': row.metrics.ctr * 100 if row.metrics.ctr else 0,
-                    'conversions': 0,  # Not available in ad-level data for this account type
-                    'conversion_value': 0,  # Not available in ad-level data for this account type
-                    'cost': row.metrics.cost_micros / 1_000_000
-                })
-        except Exception as e:
-            # Some accounts may not have ad-level data accessible
-            pass
-        
-        # 4. Keyword data with Quality Score
-        keyword_query = f"""
-            SELECT
-                ad_group_criterion.keyword.text,
-                ad_group_criterion.keyword.match_type,
-                ad_group_criterion.quality_info.quality_score,
-                ad_group_criterion.quality_info.creative_quality_score,
-                ad_group_criterion.quality_info.post_click_quality_score,
-                ad_group_criterion.quality_info.search_predicted_ctr,
-                ad_group.name,
-                campaign.name,
-                metrics.impressions,
-                metrics.clicks,
-                metrics.ctr,
-                metrics.average_cpc,
-                metrics.cost_micros,
-                metrics.conversions,
-                metrics.all_conversions_value,
-                metrics.search_impression_share,
-                metrics.search_rank_lost_impression_share
-            FROM keyword_view
-            WHERE ad_group_criterion.status != 'REMOVED'
-                AND segments.date BETWEEN '{start_date.strftime("%Y-%m-%d")}' 
-                AND '{end_date.strftime("%Y-%m-%d")}'
-                {campaign_filter}
-            ORDER BY metrics.cost_micros DESC
-        """
+        campaign_query = _CAMPAIGN_QUERY_TMPL.format(**query_params)
+        ad_group_query = _AD_GROUP_QUERY_TMPL.format(**query_params)
+        ad_query = _AD_QUERY_TMPL.format(**query_params)
+        keyword_query = _KEYWORD_QUERY_TMPL.format(**query_params)
+        search_term_query = _SEARCH_TERM_QUERY_TMPL.format(**query_params)
         
-        keyword_data = []
-        response = ga_service.search(customer_id=customer_id_numeric, query=keyword_query)
-        if api_call_counter is not None:
-            api_call_counter['count'] = api_call_counter.get('count', 0) + 1
-        for row in response:
-            # Get conversion metrics (using correct field names)
-            # Note: all_conversions_value is already in base currency (dollars), NOT micros
-            conversions = row.metrics.conversions if hasattr(row.metrics, 'conversions') else 0
-            conversion_value = row.metrics.all_conversions_value if hasattr(row.metrics, 'all_conversions_value') else 0
-            cost = row.metrics.cost_micros / 1_000_000
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            campaign_future = executor.submit(_fetch_campaign_rows, ga_service, customer_id_numeric, campaign_query)
+            ad_group_future = executor.submit(_fetch_ad_group_rows, ga_service, customer_id_numeric, ad_group_query)
+            ad_future = executor.submit(_fetch_ad_rows, ga_service, customer_id_numeric, ad_query)
+            keyword_future = executor.submit(_fetch_keyword_rows, ga_service, customer_id_numeric, keyword_query)
+            search_term_future = executor.submit(_fetch_search_term_rows, ga_service, customer_id_numeric, search_term_query)
             
-            keyword_data.append({
-                'keyword': row.ad_group_criterion.keyword.text,
-                'match_type': row.ad_group_criterion.keyword.match_type.name,
-                'quality_score': row.ad_group_criterion.quality_info.quality_score if hasattr(row.ad_group_criterion, 'quality_info') and row.ad_group_criterion.quality_info.quality_score else 0,
-                'creative_quality': row.ad_group_criterion.quality_info.creative_quality_score.name if hasattr(row.ad_group_criterion, 'quality_info') and hasattr(row.ad_group_criterion.quality_info, 'creative_quality_score') else 'N/A',
-                'post_click_quality': row.ad_group_criterion.quality_info.post_click_quality_score.name if hasattr(row.ad_group_criterion, 'quality_info') and hasattr(row.ad_group_criterion.quality_info, 'post_click_quality_score') else 'N/A',
-                'expected_ctr': row.ad_group_criterion.quality_info.search_predicted_ctr.name if hasattr(row.ad_group_criterion, 'quality_info') and hasattr(row.ad_group_criterion.quality_info, 'search_predicted_ctr') else 'N/A',
-                'ad_group': row.ad_group.name,
-                'campaign': row.campaign.name,
-                'impressions': row.metrics.impressions,
-                'clicks': row.metrics.clicks,
-                'ctr': row.metrics.ctr * 100 if row.metrics.ctr else 0,
-                'avg_cpc': row.metrics.average_cpc / 1_000_000 if row.metrics.average_cpc else 0,
-                'cost': cost,
-                'conversions': conversions,
-                'conversion_value': conversion_value,
-                'conversion_rate': (conversions / row.metrics.clicks * 100) if row.metrics.clicks > 0 else 0,
-                'cost_per_conversion': (cost / conversions) if conversions > 0 else 0,
-                'impression_share': row.metrics.search_impression_share * 100 if row.metrics.search_impression_share else 0,
-                'rank_lost_share': row.metrics.search_rank_lost_impression_share * 100 if row.metrics.search_rank_lost_impression_share else 0
-            })
+            campaign_data = campaign_future.result()
+            ad_group_data = ad_group_future.result()
+            ad_data, ads_complete = ad_future.result()
+            keyword_data = keyword_future.result()
+            search_terms_data, search_terms_complete = search_term_future.result()
         
-        # 5. Search terms (actual search queries that triggered ads)
-        search_term_query = f"""
-            SELECT
-                search_term_view.search_term,
-                ad_group.id,
-                ad_group.name,
-                campaign.id,
-                campaign.name,
-                metrics.impressions,
-                metrics.clicks,
-                metrics.ctr,
-                metrics.cost_micros,
-                metrics.average_cpc,
-                metrics.conversions,
-                metrics.all_conversions_value
-            FROM search_term_view
-            WHERE segments.date BETWEEN '{start_date.strftime("%Y-%m-%d")}' 
-                AND '{end_date.strftime("%Y-%m-%d")}'
-                {campaign_filter}
-            ORDER BY metrics.cost_micros DESC
-            LIMIT 500
-        """
-        
-        search_terms_data = []
-        try:
-            response = ga_service.search(customer_id=customer_id_numeric, query=search_term_query)
-            if api_call_counter is not None:
-                api_call_counter['count'] = api_call_counter.get('count', 0) + 1
-            for row in response:
-                cost = row.metrics.cost_micros / 1_000_000
-                # Note: all_conversions_value is already in base currency (dollars), NOT micros
-                conversions = row.metrics.conversions if hasattr(row.metrics, 'conversions') else 0
-                conversion_value = row.metrics.all_conversions_value if hasattr(row.metrics, 'all_conversions_value') else 0
-                
-                search_terms_data.append({
-                    'search_term': row.search_term_view.search_term,
-                    'ad_group_id': row.ad_group.id,
-                    'ad_group_name': row.ad_group.name,
-                    'campaign_id': row.campaign.id,
-                    'campaign_name': row.campaign.name,
-                    'impressions': row.metrics.impressions,
-                    'clicks': row.metrics.clicks,
-                    'ctr': row.metrics.ctr * 100 if row.metrics.ctr else 0,
-                    'cost': cost,
-                    'avg_cpc': row.metrics.average_cpc / 1_000_000 if row.metrics.average_cpc else 0,
-                    'conversions': conversions,
-                    'conversion_value': conversion_value,
-                    'conversion_rate': (conversions / row.metrics.clicks * 100) if row.metrics.clicks > 0 else 0,
-                    'cost_per_conversion': (cost / conversions) if conversions > 0 else 0
-                })
-        except Exception as e:
-            # Search terms may not be available for all accounts or may require specific permissions
-            pass
+        # Count all five report queries at once, after every one has completed
+        if api_call_counter is not None:
+            api_call_counter['count'] = api_call_counter.get('count', 0) + 5
         
         # 6. Auction insights (competitive data)
         # Note: Auction insights are not available via Google Ads API for most account types
@@ -365,9 +427,14 @@ def fetch_comprehensive_campaign_data(client, customer_id, campaign_id=None, dat
             'keywords': keyword_data,
             'search_terms': search_terms_data,
             'auction_insights': auction_data,
+            # Sections whose query failed or stopped part-way; their lists may be empty or truncated
+            'incomplete_sections': [
+                section for section, complete in (('ads', ads_complete), ('search_terms', search_terms_complete))
+                if not complete
+            ],
             'date_range': {
-                'start_date': start_date.strftime("%Y-%m-%d"),
-                'end_date': end_date.strftime("%Y-%m-%d"),
+                'start_date': query_params['start_date'],
+                'end_date': query_params['end_date'],
                 'days': date_range_days
             }
         }
@@ -377,6 +444,9 @@ def fetch_comprehensive_campaign_data(client, customer_id, campaign_id=None, dat
 
 def format_campaign_data_for_prompt(data):
     """Format comprehensive campaign data for Claude prompt."""
+    # Imported here so pandas is only loaded once an analysis actually runs
+    import pandas as pd
+    
     output = []
     
     # Helper function to safely format strings that might contain curly braces (DKI syntax)
@@ -465,13 +535,11 @@ Rank Lost Share: {rank_lost_share:.2f}%
     # Keywords - Sort by cost for better analysis
     output.append("\n=== KEYWORD PERFORMANCE ===")
     if data['keywords']:
-        df_keywords = pd.DataFrame(data['keywords'])
-        # Sort by cost descending to show highest spenders first
-        df_keywords = df_keywords.sort_values('cost', ascending=False)
+        # Take the 200 highest spenders, cost descending, without sorting the full list
+        df_keywords = pd.DataFrame(heapq.nlargest(200, data['keywords'], key=itemgetter('cost')))
         # Show all keywords, but note if there are many
-        if len(df_keywords) > 200:
-            output.append("(Showing top 200 of {} keywords by cost)\n".format(len(df_keywords)))
-            df_keywords = df_keywords.head(200)
+        if len(data['keywords']) > 200:
+            output.append("(Showing top 200 of {} keywords by cost)\n".format(len(data['keywords'])))
         else:
             output.append("Total Keywords: {}\n".format(len(df_keywords)))
         output.append(df_keywords.to_string(index=False))
@@ -491,17 +559,15 @@ Rank Lost Share: {rank_lost_share:.2f}%
     output.append("\n=== AD PERFORMANCE ===")
     if data['ads']:
         # Format ads with ALL headlines and descriptions clearly listed
-        df_ads = pd.DataFrame(data['ads'])
-        # Sort by cost descending to show highest spenders first
-        df_ads = df_ads.sort_values('cost', ascending=False)
-        if len(df_ads) > 100:
-            output.append("(Showing top 100 of {} ads by cost)\n".format(len(df_ads)))
-            df_ads = df_ads.head(100)
+        # Take the 100 highest spenders, cost descending, without sorting the full list
+        top_ads = heapq.nlargest(100, data['ads'], key=itemgetter('cost'))
+        if len(data['ads']) > 100:
+            output.append("(Showing top 100 of {} ads by cost)\n".format(len(data['ads'])))
         else:
-            output.append("Total Ads: {}\n".format(len(df_ads)))
+            output.append("Total Ads: {}\n".format(len(top_ads)))
         
         # Format each ad with all headlines and descriptions clearly listed
-        for idx, ad in df_ads.iterrows():
+        for ad in top_ads:
             output.append("\n--- Ad ID: {} ---".format(ad['ad_id']))
             output.append("Ad Group: {} | Campaign: {}".format(ad['ad_group'], ad['campaign']))
             output.append("Status: {} | Type: {}".format(ad['status'], ad['ad_type']))
@@ -538,21 +604,19 @@ Rank Lost Share: {rank_lost_share:.2f}%
             output.append("")  # Empty line between ads
         
         # Add summary statistics
-        if len(df_ads) > 0:
+        if top_ads:
             output.append("\nAd Summary:")
-            output.append("  Average CTR: {:.2f}%".format(df_ads['ctr'].mean()))
-            output.append("  Average Cost: ${:.2f}".format(df_ads['cost'].mean()))
+            output.append("  Average CTR: {:.2f}%".format(sum(ad['ctr'] for ad in top_ads) / len(top_ads)))
+            output.append("  Average Cost: ${:.2f}".format(sum(ad['cost'] for ad in top_ads) / len(top_ads)))
     else:
         output.append("No ad data available.")
     
     # Search Terms (actual queries that triggered ads)
     output.append("\n=== SEARCH TERMS PERFORMANCE ===")
     if data.get('search_terms'):
+        # The query already returns only the 100 highest-cost search terms
         df_search_terms = pd.DataFrame(data['search_terms'])
         # Show top performing and underperforming search terms
-        if len(df_search_terms) > 100:
-            output.append("(Showing top 100 of {} search terms)\n".format(len(data['search_terms'])))
-            df_search_terms = df_search_terms.head(100)
         output.append(df_search_terms.to_string(index=False))
     else:
         output.append("No search terms data available. This may require additional API permissions.")
@@ -6,9 +6,15 @@ Fetches keyword competition, search volume, and suggested bid data from Google A
 
 from google.ads.googleads.client import GoogleAdsClient
 from google.ads.googleads.errors import GoogleAdsException
+from authenticate import get_service
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import os
 
+# Upper bound on concurrent Keyword Planner batch requests; kept small because
+# KeywordPlanIdeaService is rate limited more tightly than reporting queries
+MAX_PARALLEL_BATCHES = 3
+
 
 def fetch_keyword_planner_data(client, customer_id, keywords_list, geo_targets=None, language_code="en"):
     """
@@ -35,18 +41,30 @@ def fetch_keyword_planner_data(client, customer_id, keywords_list, geo_targets=N
         all_keywords_data = []
         all_related_keywords = []
         
-        # Process in batches
-        for i in range(0, len(keywords_list), MAX_KEYWORDS_PER_REQUEST):
-            batch = keywords_list[i:i + MAX_KEYWORDS_PER_REQUEST]
-            batch_results = _fetch_keyword_planner_batch(
-                client, customer_id_numeric, batch, geo_targets, language_code
-            )
+        # Batches are independent, so request them concurrently; executor.map
+        # keeps results in batch order for the de-duplication below
+        batches = [
+            keywords_list[i:i + MAX_KEYWORDS_PER_REQUEST]
+            for i in range(0, len(keywords_list), MAX_KEYWORDS_PER_REQUEST)
+        ]
+        with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_BATCHES, len(batches))) as executor:
+            all_batch_results = list(executor.map(
+                lambda batch: _fetch_keyword_planner_batch(
+                    client, customer_id_numeric, batch, geo_targets, language_code
+                ),
+                batches
+            ))
+        
+        # Track keyword texts we've already added to avoid duplicates
+        # (built once and updated as related keywords are added)
+        existing_keyword_texts = set()
+        
+        # Merge batch results in order
+        for batch_results in all_batch_results:
             if batch_results:
                 all_keywords_data.extend(batch_results.get('keywords', []))
                 # Collect related keywords but limit total to avoid duplicates
                 related = batch_results.get('related_keywords', [])
-                # Track keyword texts we've already added to avoid duplicates
-                existing_keyword_texts = {kw.get('keyword_text', '').lower() for kw in all_related_keywords}
                 # Add only if not already in our list (check by keyword text)
                 for rel_kw in related:
                     kw_text = rel_kw.get('keyword_text', '').lower()
@@ -80,7 +98,7 @@ def _fetch_keyword_planner_batch(client, customer_id_numeric, keywords_list, geo
         Dictionary with keyword planner data
     """
     try:
-        keyword_plan_idea_service = client.get_service("KeywordPlanIdeaService")
+        keyword_plan_idea_service = get_service(client, "KeywordPlanIdeaService")
         
         # Validate keyword count
         if len(keywords_list) > 20:
@@ -184,23 +202,20 @@ def _fetch_keyword_planner_batch(client, customer_id_numeric, keywords_list, geo
         keyword_data = []
         related_keywords = []
         
+        # Lowercased seed keywords, built once for O(1) membership checks per result
+        seed_keywords = {kw.lower() for kw in keywords_list}
+        
         for result in response.results:
-            keyword_metrics = result.keyword_idea_metrics
+            # Check if this is one of the original keywords or a related keyword
+            is_seed_keyword = result.text.lower() in seed_keywords
+            # Only the first 20 related keywords are returned, so skip parsing the rest
+            if not is_seed_keyword and len(related_keywords) >= 20:
+                continue
             
-            # Handle bid micros - API v22+ may return integers directly instead of objects with .value
-            def get_micros_value(micros_obj):
-                """Extract micros value, handling both object.value and direct integer formats."""
-                if micros_obj is None:
-                    return None
-                if isinstance(micros_obj, int):
-                    return micros_obj
-                elif hasattr(micros_obj, 'value'):
-                    return micros_obj.value
-                else:
-                    return None
+            keyword_metrics = result.keyword_idea_metrics
             
-            low_bid_micros = get_micros_value(keyword_metrics.low_top_of_page_bid_micros)
-            high_bid_micros = get_micros_value(keyword_metrics.high_top_of_page_bid_micros)
+            low_bid_micros = _get_micros_value(keyword_metrics.low_top_of_page_bid_micros)
+            high_bid_micros = _get_micros_value(keyword_metrics.high_top_of_page_bid_micros)
             
             keyword_info = {
                 'keyword_text': result.text,
@@ -213,15 +228,14 @@ def _fetch_keyword_planner_batch(client, customer_id_numeric, keywords_list, geo
                 'high_top_of_page_bid': (high_bid_micros / 1_000_000) if high_bid_micros else None,
             }
             
-            # Check if this is one of the original keywords or a related keyword
-            if result.text.lower() in [kw.lower() for kw in keywords_list]:
+            if is_seed_keyword:
                 keyword_data.append(keyword_info)
             else:
                 related_keywords.append(keyword_info)
         
         return {
             'keywords': keyword_data,
-            'related_keywords': related_keywords[:20]
+            'related_keywords': related_keywords
         }
         
     except GoogleAdsException as ex:
@@ -253,6 +267,21 @@ def _fetch_keyword_planner_batch(client, customer_id_numeric, keywords_list, geo
         raise Exception(f"Error fetching Keyword Planner data: {str(e)}")
 
 
+def _get_micros_value(micros_obj):
+    """Extract micros value, handling both object.value and direct integer formats.
+    
+    API v22+ may return integers directly instead of objects with .value.
+    """
+    if micros_obj is None:
+        return None
+    if isinstance(micros_obj, int):
+        return micros_obj
+    elif hasattr(micros_obj, 'value'):
+        return micros_obj.value
+    else:
+        return None
+
+
 def _map_competition_index(competition_index):
     """Map competition index (0-100) to LOW/MEDIUM/HIGH."""
     if competition_index is None:
@@ -270,7 +299,7 @@ def get_geo_target_for_campaign(client, customer_id, campaign_id):
     customer_id_numeric = customer_id.replace("-", "")
     
     try:
-        ga_service = client.get_service("GoogleAdsService")
+        ga_service = get_service(client, "GoogleAdsService")
         query = f"""
             SELECT
                 campaign_criterion.location.geo_target_constant
@@ -281,12 +310,13 @@ def get_geo_target_for_campaign(client, customer_id, campaign_id):
         """
         
         geo_targets = []
-        response = ga_service.search(customer_id=customer_id_numeric, query=query)
+        stream = ga_service.search_stream(customer_id=customer_id_numeric, query=query)
         
-        for row in response:
-            if hasattr(row.campaign_criterion, 'location') and row.campaign_criterion.location.geo_target_constant:
-                geo_target = row.campaign_criterion.location.geo_target_constant
-                geo_targets.append(geo_target)
+        for batch in stream:
+            for row in batch.results:
+                if hasattr(row.campaign_criterion, 'location') and row.campaign_criterion.location.geo_target_constant:
+                    geo_target = row.campaign_criterion.location.geo_target_constant
+                    geo_targets.append(geo_target)
         
         return geo_targets if geo_targets else None
     except Exception as e:
@@ -308,24 +338,24 @@ def fetch_campaign_keywords(client, customer_id, campaign_id):
     customer_id_numeric = customer_id.replace("-", "")
     
     try:
-        ga_service = client.get_service("GoogleAdsService")
+        ga_service = get_service(client, "GoogleAdsService")
         query = f"""
             SELECT
-                ad_group_criterion.keyword.text,
-                ad_group_criterion.keyword.match_type
+                ad_group_criterion.keyword.text
             FROM keyword_view
             WHERE campaign.id = {campaign_id}
                 AND ad_group_criterion.status != 'REMOVED'
         """
         
         keywords_set = set()  # Use set to avoid duplicates
-        response = ga_service.search(customer_id=customer_id_numeric, query=query)
+        stream = ga_service.search_stream(customer_id=customer_id_numeric, query=query)
         
-        for row in response:
-            if hasattr(row.ad_group_criterion, 'keyword') and row.ad_group_criterion.keyword.text:
-                keyword_text = row.ad_group_criterion.keyword.text.strip()
-                if keyword_text:
-                    keywords_set.add(keyword_text)
+        for batch in stream:
+            for row in batch.results:
+                if hasattr(row.ad_group_criterion, 'keyword') and row.ad_group_criterion.keyword.text:
+                    keyword_text = row.ad_group_criterion.keyword.text.strip()
+                    if keyword_text:
+                        keywords_set.add(keyword_text)
         
         return sorted(list(keywords_set))  # Return sorted list
     except GoogleAdsException as ex:
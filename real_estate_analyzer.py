@@ -9,6 +9,7 @@ import os
 import sys
 import tempfile
 import re
+import functools
 from datetime import datetime
 from anthropic import Anthropic
 from authenticate import get_client, authenticate
@@ -25,6 +26,16 @@ try:
 except ImportError:
     STREAMLIT_AVAILABLE = False
 
+# Markdown patterns used when converting recommendations to PDF paragraphs.
+# Compiled once here since create_pdf_report() applies them to every line.
+_PRIORITY_LINE_RE = re.compile(r'^\*\*?(CRITICAL|HIGH|MEDIUM|LOW)\*\*?\s*[-:]?\s*(.*)', re.IGNORECASE)
+_NUMBERED_LINE_RE = re.compile(r'^(\d+)\.\s+(.+)$')
+_LABEL_LINE_RE = re.compile(r'^(\*\*?[A-Z][^:]+:\*\*?)\s*(.+)$')
+_BOLD_RE = re.compile(r'\*\*(.*?)\*\*')
+_ITALIC_RE = re.compile(r'\*(.*?)\*')
+_ITALIC_NOT_BOLD_RE = re.compile(r'(?<!\*)\*([^*]+?)\*(?!\*)')
+_CODE_RE = re.compile(r'`(.*?)`')
+
 # Google Drive API helper functions
 def get_drive_service():
     """Get authenticated Google Drive service."""
@@ -386,15 +397,116 @@ def upload_to_drive(service, file_path, file_name, folder_id=None):
         traceback.print_exc()
         return None, None
 
+@functools.lru_cache(maxsize=1)
+def _analysis_report_styles():
+    """Paragraph styles for create_pdf_report(), built on first use and reused for later reports."""
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.colors import HexColor
+    from reportlab.lib.enums import TA_LEFT, TA_CENTER
+    
+    styles = getSampleStyleSheet()
+    
+    # Custom styles with better spacing
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=HexColor('#1a5490'),
+        spaceAfter=20,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold'
+    )
+    
+    heading1_style = ParagraphStyle(
+        'CustomHeading1',
+        parent=styles['Heading1'],
+        fontSize=16,
+        textColor=HexColor('#1a5490'),
+        spaceAfter=12,
+        spaceBefore=24,  # More space before major sections
+        fontName='Helvetica-Bold',
+        borderWidth=1,
+        borderColor=HexColor('#1a5490'),
+        borderPadding=10,
+        backColor=HexColor('#e8f0f8')
+    )
+    
+    heading2_style = ParagraphStyle(
+        'CustomHeading2',
+        parent=styles['Heading2'],
+        fontSize=13,
+        textColor=HexColor('#2c5f8d'),
+        spaceAfter=8,
+        spaceBefore=16,  # More space before subsections
+        fontName='Helvetica-Bold'
+    )
+    
+    heading3_style = ParagraphStyle(
+        'CustomHeading3',
+        parent=styles['Heading3'],
+        fontSize=11,
+        textColor=HexColor('#3d6b9a'),
+        spaceAfter=6,
+        spaceBefore=12,
+        fontName='Helvetica-Bold'
+    )
+    
+    # Regular body text - more spacing
+    body_style = ParagraphStyle(
+        'CustomBody',
+        parent=styles['BodyText'],
+        fontSize=10,
+        leading=16,  # Increased line spacing for readability
+        alignment=TA_LEFT,
+        spaceAfter=10,  # More space between paragraphs
+        leftIndent=0,
+        rightIndent=0
+    )
+    
+    # Bullet style - only for actual lists
+    bullet_style = ParagraphStyle(
+        'CustomBullet',
+        parent=styles['BodyText'],
+        fontSize=10,
+        leading=16,
+        leftIndent=24,
+        bulletIndent=12,
+        spaceAfter=6,  # Less space between list items
+        spaceBefore=0
+    )
+    
+    # Emphasis style for important text
+    emphasis_style = ParagraphStyle(
+        'Emphasis',
+        parent=styles['BodyText'],
+        fontSize=10,
+        leading=16,
+        alignment=TA_LEFT,
+        spaceAfter=10,
+        fontName='Helvetica-Bold',
+        textColor=HexColor('#2c5f8d')
+    )
+    
+    return {
+        'title': title_style,
+        'heading1': heading1_style,
+        'heading2': heading2_style,
+        'heading3': heading3_style,
+        'body': body_style,
+        'bullet': bullet_style,
+        'emphasis': emphasis_style
+    }
+
 def create_pdf_report(recommendations, account_name, campaign_name, date_range_days, output_path):
-    """Create a professionally formatted PDF report from recommendations."""
+    """Create a professionally formatted PDF report from recommendations.
+    
+    output_path may be a file path or a writable binary file object such as io.BytesIO.
+    """
     try:
         from reportlab.lib.pagesizes import letter, A4
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
         from reportlab.lib.units import inch
         from reportlab.lib.colors import HexColor, black, darkblue, darkred, darkgreen
         from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle
-        from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
         
         doc = SimpleDocTemplate(output_path, pagesize=letter,
                               rightMargin=0.75*inch, leftMargin=0.75*inch,
@@ -402,88 +514,15 @@ def create_pdf_report(recommendations, account_name, campaign_name, date_range_d
         
         # Container for the 'Flowable' objects
         story = []
-        styles = getSampleStyleSheet()
-        
-        # Custom styles with better spacing
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=HexColor('#1a5490'),
-            spaceAfter=20,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
-        
-        heading1_style = ParagraphStyle(
-            'CustomHeading1',
-            parent=styles['Heading1'],
-            fontSize=16,
-            textColor=HexColor('#1a5490'),
-            spaceAfter=12,
-            spaceBefore=24,  # More space before major sections
-            fontName='Helvetica-Bold',
-            borderWidth=1,
-            borderColor=HexColor('#1a5490'),
-            borderPadding=10,
-            backColor=HexColor('#e8f0f8')
-        )
-        
-        heading2_style = ParagraphStyle(
-            'CustomHeading2',
-            parent=styles['Heading2'],
-            fontSize=13,
-            textColor=HexColor('#2c5f8d'),
-            spaceAfter=8,
-            spaceBefore=16,  # More space before subsections
-            fontName='Helvetica-Bold'
-        )
-        
-        heading3_style = ParagraphStyle(
-            'CustomHeading3',
-            parent=styles['Heading3'],
-            fontSize=11,
-            textColor=HexColor('#3d6b9a'),
-            spaceAfter=6,
-            spaceBefore=12,
-            fontName='Helvetica-Bold'
-        )
-        
-        # Regular body text - more spacing
-        body_style = ParagraphStyle(
-            'CustomBody',
-            parent=styles['BodyText'],
-            fontSize=10,
-            leading=16,  # Increased line spacing for readability
-            alignment=TA_LEFT,
-            spaceAfter=10,  # More space between paragraphs
-            leftIndent=0,
-            rightIndent=0
-        )
-        
-        # Bullet style - only for actual lists
-        bullet_style = ParagraphStyle(
-            'CustomBullet',
-            parent=styles['BodyText'],
-            fontSize=10,
-            leading=16,
-            leftIndent=24,
-            bulletIndent=12,
-            spaceAfter=6,  # Less space between list items
-            spaceBefore=0
-        )
-        
-        # Emphasis style for important text
-        emphasis_style = ParagraphStyle(
-            'Emphasis',
-            parent=styles['BodyText'],
-            fontSize=10,
-            leading=16,
-            alignment=TA_LEFT,
-            spaceAfter=10,
-            fontName='Helvetica-Bold',
-            textColor=HexColor('#2c5f8d')
-        )
+        # Paragraph styles are built once per process and shared by every report
+        report_styles = _analysis_report_styles()
+        title_style = report_styles['title']
+        heading1_style = report_styles['heading1']
+        heading2_style = report_styles['heading2']
+        heading3_style = report_styles['heading3']
+        body_style = report_styles['body']
+        bullet_style = report_styles['bullet']
+        emphasis_style = report_styles['emphasis']
         
         # Title
         story.append(Paragraph("Google Ads Optimization Report", title_style))
@@ -561,13 +600,13 @@ def create_pdf_report(recommendations, account_name, campaign_name, date_range_d
                 return text.replace('{', '{{').replace('}', '}}')
             
             # Check for priority labels (CRITICAL, HIGH, MEDIUM, LOW) at start of line
-            priority_match = re.match(r'^\*\*?(CRITICAL|HIGH|MEDIUM|LOW)\*\*?\s*[-:]?\s*(.*)', line, re.IGNORECASE)
+            priority_match = _PRIORITY_LINE_RE.match(line)
             if priority_match:
                 priority = priority_match.group(1).upper()
                 text = priority_match.group(2).strip()
                 # Clean markdown first
-                text = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', text)
-                text = re.sub(r'\*(.*?)\*', r'<i>\1</i>', text)
+                text = _BOLD_RE.sub(r'<b>\1</b>', text)
+                text = _ITALIC_RE.sub(r'<i>\1</i>', text)
                 # Escape braces before using in f-string
                 text_escaped = escape_braces(text)
                 formatted_text = f'<b>{priority}</b> - {text_escaped}'
@@ -579,13 +618,13 @@ def create_pdf_report(recommendations, account_name, campaign_name, date_range_d
                 continue
             
             # Check for numbered items (1., 2., etc.) - format as paragraph with number, not bullet
-            numbered_match = re.match(r'^(\d+)\.\s+(.+)$', line)
+            numbered_match = _NUMBERED_LINE_RE.match(line)
             if numbered_match:
                 num = numbered_match.group(1)
                 text = numbered_match.group(2).strip()
                 # Clean markdown
-                text = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', text)
-                text = re.sub(r'\*(.*?)\*', r'<i>\1</i>', text)
+                text = _BOLD_RE.sub(r'<b>\1</b>', text)
+                text = _ITALIC_RE.sub(r'<i>\1</i>', text)
                 # Escape braces before using in f-string
                 text_escaped = escape_braces(text)
                 formatted_text = f'<b>{num}.</b> {text_escaped}'
@@ -600,8 +639,8 @@ def create_pdf_report(recommendations, account_name, campaign_name, date_range_d
             if line.startswith('- ') or (line.startswith('* ') and not line.startswith('**')):
                 text = line[2:].strip()
                 # Clean markdown
-                text = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', text)
-                text = re.sub(r'\*(.*?)\*', r'<i>\1</i>', text)
+                text = _BOLD_RE.sub(r'<b>\1</b>', text)
+                text = _ITALIC_RE.sub(r'<i>\1</i>', text)
                 # Escape braces before using in f-string
                 text_escaped = escape_braces(text)
                 story.append(Paragraph(f"• {text_escaped}", bullet_style))
@@ -612,13 +651,13 @@ def create_pdf_report(recommendations, account_name, campaign_name, date_range_d
                 continue
             
             # Check for lines that look like labels followed by content (Issue/Opportunity:, Impact:, etc.)
-            label_match = re.match(r'^(\*\*?[A-Z][^:]+:\*\*?)\s*(.+)$', line)
+            label_match = _LABEL_LINE_RE.match(line)
             if label_match:
                 label = label_match.group(1).strip('*').strip()
                 content = label_match.group(2).strip()
                 # Clean markdown in content
-                content = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', content)
-                content = re.sub(r'\*(.*?)\*', r'<i>\1</i>', content)
+                content = _BOLD_RE.sub(r'<b>\1</b>', content)
+                content = _ITALIC_RE.sub(r'<i>\1</i>', content)
                 # Escape braces before using in f-string
                 content_escaped = escape_braces(content)
                 formatted_text = f'<b>{label}</b> {content_escaped}'
@@ -632,11 +671,11 @@ def create_pdf_report(recommendations, account_name, campaign_name, date_range_d
             # Regular paragraph - clean up markdown and format
             text = line
             # Preserve bold
-            text = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', text)
+            text = _BOLD_RE.sub(r'<b>\1</b>', text)
             # Preserve italic (but not if it's part of bold)
-            text = re.sub(r'(?<!\*)\*([^*]+?)\*(?!\*)', r'<i>\1</i>', text)
+            text = _ITALIC_NOT_BOLD_RE.sub(r'<i>\1</i>', text)
             # Code formatting
-            text = re.sub(r'`(.*?)`', r'<font name="Courier" size="9">\1</font>', text)
+            text = _CODE_RE.sub(r'<font name="Courier" size="9">\1</font>', text)
             # Escape braces to handle DKI syntax and other curly brace content
             text = escape_braces(text)
             
@@ -6547,7 +6586,7 @@ Provide your answer now:
 """
 
 class RealEstateAnalyzer:
-    def __init__(self, model="claude-sonnet-4-20250514"):
+    def __init__(self, model="claude-sonnet-4-20250514", ads_client=None):
         """
         Initialize Claude client and Google Ads client.
         
@@ -6557,6 +6596,8 @@ class RealEstateAnalyzer:
                 - "claude-3-5-sonnet-20241022" (alternative Sonnet version)
                 - "claude-3-5-haiku-20241022" (fast, cost-effective)
                 - "claude-3-opus-20240229" (most powerful, higher cost)
+            ads_client: Optional existing GoogleAdsClient to reuse (avoids a second
+                authentication and a second set of gRPC channels)
         """
         # Initialize Claude
         api_key = os.getenv("ANTHROPIC_API_KEY")
@@ -6570,6 +6611,10 @@ class RealEstateAnalyzer:
         self.model = model
         
         # Initialize Google Ads client
+        if ads_client is not None:
+            self.ads_client = ads_client
+            return
+        
         print("Authenticating with Google Ads API...")
         self.ads_client = get_client()
         if not self.ads_client: